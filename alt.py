@@ -0,0 +1,119 @@
+import heapq
+from array import array
+from typing import Callable, List
+
+from grid import BLOCKED, Grid, Position
+
+UNREACHED = -1
+
+class LandmarkHeuristic:
+    """ALT lower bounds from exact step-cost distances to a few anchor cells.
+
+    Anchors are picked by farthest-point selection, so they sit on the rim of the
+    map where the triangle inequality bounds are tightest. For an anchor L,
+
+        d(n, goal) >= d(L, goal) - d(L, n)
+        d(n, goal) >= d(n, L) - d(goal, L)
+
+    and since a step costs the cell it enters, d(x, L) = d(L, x) - cost(x) + cost(L),
+    so one Dijkstra run per anchor covers both bounds. The estimate is the best of
+    these and the scaled Manhattan distance. Any edit that changes a step cost
+    marks the fields stale; they are rebuilt on the next estimator() call.
+    """
+
+    def __init__(self, grid: Grid, count: int = 4):
+        self.grid = grid
+        self.count = count
+        self.anchors: List[int] = []
+        self.fields: List[array] = []               # per anchor: cost from the anchor to every cell
+        self.builds = 0
+        self._stale = True
+        grid.subscribe(self._on_cell_changed)
+
+    def close(self):
+        # stops tracking grid edits; the fields go stale after this
+        self.grid.unsubscribe(self._on_cell_changed)
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def warm(self):
+        # rebuilds the fields now if edits made them stale, instead of on the next estimator() call
+        if self._stale:
+            self._build()
+
+    def preload(self, anchors: List[int], fields: List[array]):
+        # adopts anchors and fields built for this grid elsewhere, e.g. loaded from a snapshot
+        self.anchors, self.fields = list(anchors), list(fields)
+        self._stale = False
+
+    def estimator(self, goal: Position) -> Callable[[int], int]:
+        if self._stale:
+            self._build()
+        grid = self.grid
+        cells, costs, cols, min_cost = grid.cells, grid.costs, grid.cols, grid.min_cost
+        goal_cell = grid.cell_id(*goal)
+        goal_row, goal_col = goal
+        goal_cost = costs[cells[goal_cell]]
+        bounds = [(field, field[goal_cell]) for field in self.fields if field[goal_cell] != UNREACHED]
+
+        def heuristic(cell: int) -> int:
+            row, col = divmod(cell, cols)
+            best = (abs(row - goal_row) + abs(col - goal_col)) * min_cost
+            cell_cost = costs[cells[cell]]
+            for field, to_goal in bounds:
+                from_anchor = field[cell]
+                if from_anchor == UNREACHED:
+                    continue
+                best = max(best, to_goal - from_anchor,
+                           (from_anchor - cell_cost) - (to_goal - goal_cost))
+            return best
+        return heuristic
+
+    def _build(self):
+        grid = self.grid
+        self.anchors, self.fields = [], []
+        self.builds += 1
+        self._stale = False
+        seed = next((cell for cell in range(grid.size) if grid.is_open(cell)), None)
+        if seed is None:
+            return
+
+        # farthest-point selection: each anchor maximises its distance to the ones already chosen
+        nearest = self._dijkstra(seed)             # the first anchor is the cell farthest from the seed
+        for _ in range(self.count):
+            anchor = max(range(grid.size), key=nearest.__getitem__)
+            if nearest[anchor] <= 0 and self.anchors:
+                break                               # every reachable cell is already an anchor
+            field = self._dijkstra(anchor)
+            if not self.anchors:
+                nearest = array('i', field)
+            else:
+                for cell in range(grid.size):
+                    if field[cell] < nearest[cell]:
+                        nearest[cell] = field[cell]
+            self.anchors.append(anchor)
+            self.fields.append(field)
+
+    def _dijkstra(self, source: int) -> array:
+        grid = self.grid
+        cells, costs = grid.cells, grid.costs
+        dist = array('i', [UNREACHED]) * grid.size
+        dist[source] = 0
+        queue = [(0, source)]
+        while queue:
+            d, cell = heapq.heappop(queue)
+            if d > dist[cell]:
+                continue
+            for neighbor in grid.neighbors(cell):
+                step = d + costs[cells[neighbor]]
+                if dist[neighbor] == UNREACHED or step < dist[neighbor]:
+                    dist[neighbor] = step
+                    heapq.heappush(queue, (step, neighbor))
+        return dist
+
+    def _on_cell_changed(self, cell: int, old: int, new: int):
+        costs = self.grid.costs
+        if (old == BLOCKED) != (new == BLOCKED) or costs[old] != costs[new]:
+            self._stale = True
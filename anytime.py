@@ -0,0 +1,163 @@
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
+
+from grid import Grid, Position, trace_parents
+from stats import ExpandHook, SearchResult, SearchStats
+
+INF = float("inf")
+
+ImproveHook = Callable[[List[Position], int, Optional[float]], None]     # (path, cost, suboptimality bound) per better path
+
+def anytime_search(grid: Grid, start: Position, goal: Position, epsilon: float = 3.0, decay: float = 0.5,
+                   time_budget_ms: Optional[float] = None, max_expansions: Optional[int] = None,
+                   max_frontier: Optional[int] = None, on_expand: Optional[ExpandHook] = None,
+                   on_improve: Optional[ImproveHook] = None) -> SearchResult:
+    """ARA*: weighted A* passes with a falling epsilon, each reusing the last one's work.
+
+    The first pass (f = g + epsilon * h) finds a path quickly. Each later pass
+    lowers epsilon by decay and repairs only what the tighter weighting changes,
+    until epsilon reaches 1 (optimal) or the time or expansion budget runs out.
+    The best path found so far is returned either way. stats.suboptimality holds
+    the bound proven by the last completed pass: cost <= suboptimality * optimal
+    cost, the smaller of epsilon and cost / (lowest g + h still unexpanded). It
+    is None when there is no path or no pass completed.
+
+    max_frontier turns this into a beam search: when the open list outgrows it,
+    the worst quarter by f is dropped from it. A plain beam is incomplete, since
+    it can drop every way to the goal, so dropped cells are remembered and the
+    best of them are re-seeded whenever the open list runs dry. A reachable goal
+    is therefore still found given enough budget, dropped cells count towards
+    the lower bound, and once anything has been dropped the bound no longer uses
+    epsilon. The cap bounds the open list only, which keeps heap work small:
+    the g values and parents of every generated cell, dropped ones included,
+    are kept for path tracing and re-seeding, so memory still grows with the
+    area searched. stats.peak_frontier reports the capped open list and
+    stats.peak_memory every cell held.
+    """
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    deadline = None if time_budget_ms is None else start_time + time_budget_ms / 1000
+    cols = grid.cols
+    cells, costs, min_cost = grid.cells, grid.costs, grid.min_cost
+    start_cell = grid.cell_id(*start)
+    goal_cell = grid.cell_id(*goal)
+    goal_row, goal_col = goal
+    counter = itertools.count()
+
+    def heuristic(cell: int) -> int:
+        row, col = divmod(cell, cols)
+        return (abs(row - goal_row) + abs(col - goal_col)) * min_cost
+
+    g_cost: Dict[int, int] = {start_cell: 0}
+    parent: Dict[int, Optional[int]] = {start_cell: None}
+    open_set = {start_cell}                         # heap entries for cells not in here are stale
+    inconsistent = set()                            # improved after being closed in this pass; reopened next pass
+    closed = set()
+    dropped = set()                                 # cut from the open list by the frontier cap, not yet re-seeded
+    trimmed = False                                 # the cap has reordered expansions, voiding the epsilon guarantee
+    best_path, best_cost = None, None
+    bound = None
+
+    def entry(cell: int) -> tuple:
+        # heap entry (f, h, counter, cell): f-ties go to the lower h, as in astar_search
+        h = heuristic(cell)
+        return g_cost[cell] + epsilon * h, h, next(counter), cell
+
+    def over_budget() -> bool:
+        if max_expansions is not None and stats.nodes_expanded >= max_expansions:
+            return True
+        return deadline is not None and time.perf_counter() >= deadline
+
+    def lower_bound() -> float:
+        pending = [g_cost[cell] + heuristic(cell) for cell in itertools.chain(open_set, inconsistent, dropped)]
+        return min(pending, default=INF)
+
+    def trim_frontier() -> List:
+        # keeps the best three quarters of the open cells by f; g and parent stay, so paths through them stay valid
+        nonlocal trimmed
+        trimmed = True
+        ranked = sorted(entry(cell) for cell in open_set)
+        keep = max(1, max_frontier * 3 // 4)
+        for *_, cell in ranked[keep:]:
+            open_set.discard(cell)
+            dropped.add(cell)
+        return ranked[:keep]
+
+    def reseed() -> List:
+        # the open list ran dry: reopen the best dropped cells, as many as the cap allows
+        ranked = sorted(entry(cell) for cell in dropped)[:max(1, max_frontier * 3 // 4)]
+        for *_, cell in ranked:
+            dropped.discard(cell)
+            open_set.add(cell)
+        stats.heap_pushes += len(ranked)
+        return ranked
+
+    while True:
+        heap = [entry(cell) for cell in open_set]
+        heapq.heapify(heap)
+        closed.clear()
+        finished = True
+        while heap or dropped:
+            if not heap:
+                heap = reseed()
+            f, _, _, cell = heap[0]
+            if cell not in open_set or f != g_cost[cell] + epsilon * heuristic(cell):
+                heapq.heappop(heap)
+                stats.stale_pops += 1
+                continue
+            if g_cost.get(goal_cell, INF) <= f:
+                break                               # this pass's solution is epsilon-suboptimal
+            if over_budget():
+                finished = False
+                break
+            heapq.heappop(heap)
+            open_set.discard(cell)
+            closed.add(cell)
+            stats.nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(cell), g_cost[cell])
+
+            for neighbor in grid.neighbors(cell):
+                stats.nodes_generated += 1
+                tentative_g = g_cost[cell] + costs[cells[neighbor]]
+                if tentative_g >= g_cost.get(neighbor, INF):
+                    continue
+                g_cost[neighbor] = tentative_g
+                parent[neighbor] = cell
+                dropped.discard(neighbor)
+                if neighbor in closed:
+                    inconsistent.add(neighbor)
+                else:
+                    open_set.add(neighbor)
+                    heapq.heappush(heap, entry(neighbor))
+                    stats.heap_pushes += 1
+            if max_frontier is not None and len(open_set) > max_frontier:
+                heap = trim_frontier()
+            stats.peak_frontier = max(stats.peak_frontier, len(open_set))
+            stats.peak_closed = max(stats.peak_closed, len(closed))
+            stats.peak_memory = max(stats.peak_memory, len(g_cost))
+
+        improved = goal_cell in g_cost and (best_cost is None or g_cost[goal_cell] < best_cost)
+        if improved:
+            # an ancestor may have been improved since the goal was reached, so price the path itself
+            best_path = trace_parents(grid, parent, goal_cell)
+            best_cost = sum(costs[cells[grid.cell_id(*position)]] for position in best_path[1:])
+        if finished and best_cost is not None:
+            floor = lower_bound()
+            proven = max(1.0, best_cost / floor) if floor > 0 else 1.0
+            if not trimmed:
+                proven = min(epsilon, proven)       # the weighted pass guarantee only holds without a frontier cap
+            bound = proven if bound is None else min(bound, proven)
+        if improved and on_improve is not None:
+            on_improve(best_path, best_cost, bound)
+        if not finished or (bound is not None and bound <= 1) or epsilon <= 1 or not (open_set or inconsistent or dropped):
+            break
+        epsilon = max(1.0, epsilon - decay if bound is None else min(epsilon - decay, bound))
+        open_set |= inconsistent
+        inconsistent.clear()
+
+    stats.suboptimality = bound
+    stats.wall_ms = (time.perf_counter() - start_time) * 1000
+    return SearchResult(best_path, best_cost, stats)
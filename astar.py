@@ -1,12 +1,33 @@
 import heapq
-import string
+import itertools
 import time
+from collections import OrderedDict
+
+from alt import LandmarkHeuristic
+from anytime import anytime_search
+from bidirectional import bidirectional_search
+from campusmap import CampusMap, default_map, save_snapshot
+from distcache import DistanceTable
+from dstar import IncrementalPlanner
+from grid import BLOCKED, EATERY, WALKABLE, trace_parents
+from hpa import ClusterMap
+from jps import jps_search
+from nearest import multi_goal_search
+from registry import Eatery, EateryRegistry
+from profiling import HEAP, NEIGHBORS, TRACE, VISITED
+from render import route_viewport, write_grid
+from routecache import RouteCache
+from stats import SearchResult, SearchStats
+from tour import plan_tour
+
+__all__ = ["Eatery", "Node", "Pathfinder", "print_menu", "run_astar"]   # Eatery moved to registry and is re-exported for old imports
 
 class Node:
+    __slots__ = ("cell_position", "parent_cell", "g", "h", "f")
+
     def __init__(self, position, parent, g, h):
         self.cell_position = position
         self.parent_cell = parent                   # the cell that it visited before the current cell
-        self.eateries_data = []                     
         self.g = g
         self.h = h
         self.f = g + h
@@ -20,98 +41,66 @@ class Node:
     def __hash__(self):                             # hash method - if equal according to __eq__, then hash should be equal
         return hash(self.cell_position)
         
-class Eatery:
-    def __init__(self, name: str, row: int, col: int):
-        self.name = name
-        self.row = row
-        self.col = col
-
-    def __repr__(self):
-        return f"{self.name}: {self.row}, {self.col}"
-
 class Pathfinder:                                   # class for the pathfinder which uses the A* search algorithm
-    def __init__(self):
-        self.no_of_rows = 10
-        self.no_of_cols = 20
-    
+    def __init__(self, campus_map=None, cache_size=1024, max_planners=8):
+        self.campus_map = campus_map if campus_map is not None else default_map()
         self.grid = self.initialize_grid()
-        self.eateries = {}
-        self.initialize_dlsu_eateries()         
+        self.no_of_rows = self.grid.rows
+        self.no_of_cols = self.grid.cols
+
+        self.eateries = self.initialize_dlsu_eateries()     # letter key -> Eatery, with name and position indexes
+        self.distance_table = DistanceTable(self.grid, [(e.row, e.col) for e in self.eateries.values()])
+        self.cluster_map = None                     # HPA* abstraction, built on the first hierarchical query
+        self.planners = OrderedDict()               # goal -> D* Lite planner, kept between queries and grid edits; least recently used first
+        self.max_planners = max_planners            # each planner holds map-sized state and listens to every edit, so only this many are kept
+        self.landmark_heuristic = None              # ALT anchor fields, built on the first landmark query
+        self.route_cache = RouteCache(cache_size)   # repeated astar_search queries on an unchanged grid
+        self.route_matrix = None                    # generation-stamped search buffers, allocated on the first matrix query
+        self.load_indexes(self.campus_map.indexes)
     
-    def initialize_grid(self):                      # 0 - walkable, 1 - blocked, 2 - eatery
-        grid = [
-            #0  1  2  3  4  5  6  7  8  9 10 11 12 13 14 15 16 17 18 19
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0], # row 0
-            [0, 0, 0, 2, 2, 1, 1, 1, 1, 1, 2, 0, 1, 2, 2, 0, 1, 2, 1, 2], # row 1
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], # row 2
-            [1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1], # row 3
-            [1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1], # row 4
-            [1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1], # row 5
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], # row 6
-            [1, 1, 1, 2, 2, 2, 0, 2, 1, 2, 2, 1, 0, 0, 0, 0, 0, 0, 2, 2], # row 7
-            [0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0], # row 8
-            [1, 1, 1, 1, 2, 2, 1, 2, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 0, 0]  # row 9
-        ]
-        
-        return grid
+    def initialize_grid(self):                      # 0 - walkable, 1 - blocked, 2 - eatery, 3+ - weighted terrain (see grid.STEP_COSTS)
+        return self.campus_map.grid
         
     def initialize_dlsu_eateries(self):
-        self.eateries_data = [ 
-            # Name, Row, Col
-            ("University Mall", 7, 19),
-            ("McDonald's", 7, 18),
-            ("Perico's", 8, 17),
-            ("Bloemen Hall", 9, 11),
-            ("W.H. Taft Residence", 7, 10),
-            ("EGI Taft", 7, 9),
-            ("Castro St.", 7, 7),
-            ("Agno Food Court", 9, 7),
-            ("One Archers'", 7, 5),
-            ("La Casita (Br. Andrew Gonzalez Hall)", 7, 4),
-            ("La Casita (Enrique Razon Sports Center)", 9, 4),
-            ("Green Mall", 7, 3),
-            ("Green Court", 9, 5),
-            ("Sherwood", 1, 3),
-            ("Jollibee", 1, 4),
-            ("Dagonoy St.", 1, 10),
-            ("Burgundy", 1, 13),
-            ("Estrada St.", 1, 14),
-            ("D'Student's Place", 1, 17),
-            ("Leon Guinto St.", 0, 13),
-            ("P. Ocampo St.", 1, 19),
-            ("Fidel A. Reyes St.", 8, 1)
-        ]
-
-        letters = string.ascii_uppercase
-        for i, (name, row, col) in enumerate(self.eateries_data):
-            eatery = Eatery(name, row, col)
-            letter_key = letters[i] if i < len(letters) else f"{letters[i//26-1]}{letters[i%26]}"
-            self.eateries[letter_key] = eatery
+        return EateryRegistry(self.campus_map.eateries, self.campus_map.keys)     # Name, Row, Col records; keys A, B, ... Z, AA, ... unless the map saved its own
+    
+    def load_indexes(self, indexes):               # adopts precomputed distance and landmark fields, e.g. from a snapshot
+        if "distance" in indexes:
+            self.distance_table.preload(indexes["distance"])
+        if "landmarks" in indexes:
+            count, anchors, fields = indexes["landmarks"]
+            self.landmark_heuristic = LandmarkHeuristic(self.grid, count)
+            self.landmark_heuristic.preload(anchors, fields)
+            
+    def save_snapshot(self, path, precompute=True):   # grid, keyed eateries and search indexes in one mmap-able file; precompute builds the indexes first
+        if precompute:
+            self.distance_table.warm()
+            if self.landmark_heuristic is None:
+                self.landmark_heuristic = LandmarkHeuristic(self.grid)
+            self.landmark_heuristic.warm()
+        
+        indexes = {"distance": {cell: field for cell, field in self.distance_table.fields.items() if field is not None}}
+        if self.landmark_heuristic is not None and not self.landmark_heuristic.stale:
+            indexes["landmarks"] = (self.landmark_heuristic.count, self.landmark_heuristic.anchors, self.landmark_heuristic.fields)
+        keys = list(self.eateries)
+        records = [(self.eateries[key].name, self.eateries[key].row, self.eateries[key].col) for key in keys]
+        save_snapshot(CampusMap(self.grid, records), path, keys, indexes)
     
     def is_valid(self, row, col):                   # checks if the coordinates are within the grid
         return (row >= 0) and (row < self.no_of_rows) and (col >= 0) and (col < self.no_of_cols)
     
     def is_walkable(self, row, col):                
-        return self.grid[row][col] == 0 or self.grid[row][col] == 2
+        return self.grid.get(row, col) != BLOCKED
     
     def is_destination(self, row, col, dest):             # where dest[0] is the x-coordinate and dest[1] is the y-coordinate
         return row == dest[0] and col == dest[1]
     
-    def calculate_heuristic(self, x, y):                  # uses manhattan distance for the heuristic value
-        return abs(x[0] - y[0]) + abs(x[1] - y[1])      
+    def calculate_heuristic(self, x, y):                  # manhattan distance times the cheapest step, so it never overestimates
+        return (abs(x[0] - y[0]) + abs(x[1] - y[1])) * self.grid.min_cost
     
     def get_neighbors(self, position):
-        row, col = position
-        neighbors = []
-        
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        
-        for x, y in directions:
-            new_row, new_col = row + x, col + y
-            if self.is_valid(new_row, new_col) and self.is_walkable(new_row, new_col):
-                neighbors.append((new_row, new_col))
-                
-        return neighbors
+        grid = self.grid
+        return [grid.position(cell) for cell in grid.neighbors(grid.cell_id(*position))]
     
     def trace_path(self, node):
         path = []
@@ -120,59 +109,182 @@ class Pathfinder:                                   # class for the pathfinder w
             path.append(current.cell_position)
             current = current.parent_cell
         return path[::-1]                           # reverses the path to get the start -> goal path
-    
-    def astar_search(self, start, goal):
-        discovered_nodes = []
-        visited_nodes = set()
-        g_cost = {}
 
-        max_memory = 0  # max number of nodes held at once
+    def astar_search(self, start, goal, on_expand=None, heuristic=None, profile=None):    # returns a SearchResult; on_expand(cell, g) runs per expansion when given
+        # heuristic(cell), when given, replaces the scaled manhattan estimate (e.g. LandmarkHeuristic.estimator(goal));
+        # profile, a profiling.PhaseProfile, times the loop's phases
         start_time = time.perf_counter()  # starts tracking time
+        cache_key = version = None
+        if on_expand is None and heuristic is None and profile is None:     # hooked, custom-heuristic or profiled runs always search
+            cache_key, version = ("astar", tuple(start), tuple(goal)), self.grid.version
+            cached = self.route_cache.get(cache_key, version)
+            if cached is not None:
+                cached.stats.wall_ms = (time.perf_counter() - start_time) * 1000
+                return cached
+
+        stats = SearchStats()
+
+        grid = self.grid
+        cells = grid.cells
+        costs = grid.costs
+        min_cost = grid.min_cost
+        cols = grid.cols
+        size = grid.size
+        goal_row, goal_col = goal
+        goal_cell = grid.cell_id(*goal)
+        start_cell = grid.cell_id(*start)
+
+        # heap entries are plain (f, h, counter, cell) tuples so comparisons stay in C;
+        # lower h wins ties on f, and the counter keeps equal entries first-in first-out
+        counter = itertools.count()
+        h = self.calculate_heuristic(start, goal) if heuristic is None else heuristic(start_cell)
+        discovered_nodes = [(h, h, next(counter), start_cell)]
+        visited_nodes = set()
+        g_cost = {start_cell: 0}
+        parent = {start_cell: None}
 
-        start_node = Node(start, None, 0, self.calculate_heuristic(start, goal))
-        heapq.heappush(discovered_nodes, start_node)
-        g_cost[start] = 0
+        max_memory = 0  # max number of nodes held at once
+        max_frontier = 0
+        nodes_expanded = 0
+        nodes_generated = 0
+        heap_pushes = 1
+        stale_pops = 0
+        path = total_cost = None
+        lap = None   # bound once so unprofiled runs pay a single local check per phase
+        if profile is not None:
+            lap = profile.lap
+            profile.start()
 
         while discovered_nodes:
             # starts tracking memory
             current_memory = len(discovered_nodes) + len(visited_nodes)
             max_memory = max(max_memory, current_memory)
+            max_frontier = max(max_frontier, len(discovered_nodes))
 
-            current_node = heapq.heappop(discovered_nodes)
+            _, _, _, current = heapq.heappop(discovered_nodes)
+            if lap:
+                lap(HEAP)
 
-            if current_node.cell_position in visited_nodes:
+            if current in visited_nodes:
+                stale_pops += 1
+                if lap:
+                    lap(VISITED)
                 continue
 
-            visited_nodes.add(current_node.cell_position)
-
-            if self.is_destination(current_node.cell_position[0], current_node.cell_position[1], goal):
-                end_time = time.perf_counter()
-                
-                total_time_ms = (end_time - start_time) * 1000
-                print(f"Time taken: {total_time_ms:.6f} ms")
-
-                print(f"Peak memory usage: {max_memory} nodes\n")
-
-                return self.trace_path(current_node), current_node.g
+            visited_nodes.add(current)
+            nodes_expanded += 1
+            if lap:
+                lap(VISITED)
+            current_g = g_cost[current]
+            if on_expand is not None:
+                on_expand(grid.position(current), current_g)
+
+            if current == goal_cell:
+                path, total_cost = trace_parents(grid, parent, current), current_g
+                if lap:
+                    lap(TRACE)
+                break
 
-            for neighbor_pos in self.get_neighbors(current_node.cell_position):
-                if neighbor_pos in visited_nodes:
+            col = current % cols
+            for neighbor in (current - cols, current + cols,
+                             current - 1 if col > 0 else -1, current + 1 if col < cols - 1 else -1):
+                if neighbor < 0 or neighbor >= size or cells[neighbor] == BLOCKED or neighbor in visited_nodes:
                     continue
 
-                tentative_g = current_node.g + 1
-
-                if neighbor_pos not in g_cost or tentative_g < g_cost[neighbor_pos]:
-                    g_cost[neighbor_pos] = tentative_g
-                    h_cost = self.calculate_heuristic(neighbor_pos, goal)
-                    neighbor_node = Node(neighbor_pos, current_node, tentative_g, h_cost)
-                    heapq.heappush(discovered_nodes, neighbor_node)
-
-        # If path not found
-        end_time = time.time()
-        total_time = end_time - start_time
-        print(f"Time taken: {total_time:.4f} seconds")
-        print(f"Peak memory usage: {max_memory} nodes\n")
-        return None
+                nodes_generated += 1
+                tentative_g = current_g + costs[cells[neighbor]]    # step cost is the cost of the cell entered
+                if tentative_g < g_cost.get(neighbor, tentative_g + 1):
+                    g_cost[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    if heuristic is None:
+                        neighbor_row, neighbor_col = divmod(neighbor, cols)
+                        h = (abs(neighbor_row - goal_row) + abs(neighbor_col - goal_col)) * min_cost
+                    else:
+                        h = heuristic(neighbor)
+                    if lap:
+                        lap(NEIGHBORS)
+                    heapq.heappush(discovered_nodes, (tentative_g + h, h, next(counter), neighbor))
+                    heap_pushes += 1
+                    if lap:
+                        lap(HEAP)
+            if lap:
+                lap(NEIGHBORS)
+
+        stats.wall_ms = (time.perf_counter() - start_time) * 1000
+        stats.nodes_expanded = nodes_expanded
+        stats.nodes_generated = nodes_generated
+        stats.heap_pushes = heap_pushes
+        stats.stale_pops = stale_pops
+        stats.peak_frontier = max_frontier
+        stats.peak_closed = len(visited_nodes)
+        stats.peak_memory = max_memory
+        result = SearchResult(path, total_cost, stats)
+        if cache_key is not None:
+            self.route_cache.put(cache_key, version, result)
+        return result
+        
+    def bidirectional_route(self, start, goal, on_expand=None):   # front-to-end bidirectional A*; stats split expansions per direction
+        return bidirectional_search(self.grid, start, goal, on_expand=on_expand)
+        
+    def hierarchical_route(self, start, goal, cluster_size=10):   # HPA*: near-optimal; stats count abstract nodes
+        if self.cluster_map is None or self.cluster_map.size != cluster_size:
+            if self.cluster_map is not None:
+                self.cluster_map.close()
+            self.cluster_map = ClusterMap(self.grid, cluster_size)
+        return self.cluster_map.route(start, goal)
+        
+    def landmark_route(self, start, goal, on_expand=None, anchors=4):  # A* with ALT lower bounds; tighter than manhattan on weighted terrain
+        if self.landmark_heuristic is None or self.landmark_heuristic.count != anchors:
+            if self.landmark_heuristic is not None:
+                self.landmark_heuristic.close()
+            self.landmark_heuristic = LandmarkHeuristic(self.grid, anchors)
+        return self.astar_search(start, goal, on_expand, self.landmark_heuristic.estimator(goal))
+        
+    def anytime_route(self, start, goal, on_expand=None, time_budget_ms=None, max_expansions=None, max_frontier=None, epsilon=3.0):   # ARA*: best path within the budget; stats.suboptimality bounds its cost against the optimum
+        return anytime_search(self.grid, start, goal, epsilon, time_budget_ms=time_budget_ms, max_expansions=max_expansions,
+                              max_frontier=max_frontier, on_expand=on_expand)
+        
+    def incremental_route(self, start, goal, on_expand=None):   # D* Lite: replans only what grid edits since the last query changed
+        goal = tuple(goal)
+        planner = self.planners.get(goal)
+        if planner is None:
+            planner = self.planners[goal] = IncrementalPlanner(self.grid, goal)
+            while len(self.planners) > self.max_planners:
+                self.planners.popitem(last=False)[1].close()    # unsubscribes the evicted planner from grid edits
+        else:
+            self.planners.move_to_end(goal)
+        return planner.route(start, on_expand)
+        
+    def jps_route(self, start, goal, on_expand=None):   # Jump Point Search; stats count jump points
+        return jps_search(self.grid, start, goal, on_expand)
+        
+    def eatery_route(self, start, eatery):          # answers from the precomputed distance field instead of searching
+        return self.distance_table.route(start, (eatery.row, eatery.col))
+        
+    def nearest_eateries(self, start, k=1):        # k closest eateries by walking cost from a single A* expansion
+        at_position = {}
+        for eatery in self.eateries.values():
+            at_position.setdefault((eatery.row, eatery.col), []).append(eatery)
+
+        found, nodes_expanded = multi_goal_search(self.grid, start, at_position.keys(), k)
+        ranked = [(eatery, path, cost) for position, path, cost in found for eatery in at_position[position]]
+        return ranked[:k], nodes_expanded
+        
+    def eatery_distance_field(self, use_numpy=None):  # whole-map cost to the nearest EATERY cell plus Voronoi labels (that cell's id), flat by cell id
+        from fields import distance_field           # imported here: fields loads NumPy, which would slow every Pathfinder import
+        return distance_field(self.grid, use_numpy=use_numpy)
+        
+    def eatery_matrix(self, sources):              # CostMatrix of walking costs, one row per source, one column per key in the returned list
+        if self.route_matrix is None:
+            from matrix import RouteMatrix          # imported here for the same reason as fields
+            self.route_matrix = RouteMatrix(self.grid)
+        keys = sorted(self.eateries)
+        targets = [(self.eateries[key].row, self.eateries[key].col) for key in keys]
+        return keys, self.route_matrix.costs(sources, targets)
+        
+    def food_crawl(self, start, eateries, return_to_start=False):  # cheapest order to visit several eateries; a TourResult with the stitched path
+        stops = [(eatery.row, eatery.col) for eatery in eateries]
+        return plan_tour(self.grid, start, stops, return_to_start)
         
     def input_eatery(self, input_str):
         input_str = input_str.strip().upper()
@@ -180,50 +292,30 @@ class Pathfinder:                                   # class for the pathfinder w
         if input_str in self.eateries:
             return self.eateries[input_str]
         
-        for key, eatery in self.eateries.items():
-            if input_str.lower() in eatery.name.lower():
-                return eatery
-            
-        return None
+        key = self.eateries.find(input_str)        # first eatery whose name contains the input
+        return self.eateries[key] if key else None
     
     def list_eateries(self):
         print("\nList of Eateries:")
         print("-" * 60)
             
-        # Get only letter keys (exclude name duplicates)
-        letter_keys = {k: v for k, v in self.eateries.items() if len(k) <= 2 and k.isalpha()}
-            
-        for letter, eatery in sorted(letter_keys.items()):
-            print(f"{letter.upper()} - {eatery}")
+        for letter, eatery in sorted(self.eateries.items()):
+            print(f"{letter} - {eatery}")
             
-    def print_path_on_grid(self, path, start, goal):
-        # creates a copy of the grid for display
-        display_grid = [row[:] for row in self.grid]
-        
-        for i, (row, col) in enumerate(path):
-            if (row, col) == start:
-                display_grid[row][col] = 'S'  # start node
-            elif (row, col) == goal:
-                display_grid[row][col] = 'G'  # goal node
-            else:
-                display_grid[row][col] = '*'  # path taken
+    def print_path_on_grid(self, path, start, goal, margin=None):   # margin crops the view to the route plus that many cells
+        viewport = route_viewport(self.grid, path, margin) if margin is not None and path else None
         
         print("\nGrid with path:")
-        print("S = Start, G = Goal, * = Path, 0 = Walkable, 1 = Blocked, 2 = Eatery")
+        print("S = Start, G = Goal, * = Path, 0 = Walkable, 1 = Blocked, 2 = Eatery, 3 = Stairs, 4 = Crowded, 5 = Covered")
         print("-" * 60)
+        write_grid(self.grid, path, start, goal, width=2, row_labels=True, viewport=viewport)
         
-        for i, row in enumerate(display_grid):
-            print(f"Row {i:2d}: ", end="")
-            for cell in row:
-                print(f"{str(cell):>2}", end=" ")
-            print()
-        
-    def find_eatery(self):
+    def input_start(self):                          # prompts until a walkable in-bounds start is given
         while True:
             try:
                 print("\nEnter your starting position")
-                start_row = int(input("Row (0 - 9): "))
-                start_col = int(input("Column (0 - 19): "))
+                start_row = int(input(f"Row (0 - {self.no_of_rows - 1}): "))
+                start_col = int(input(f"Column (0 - {self.no_of_cols - 1}): "))
                 
                 if not self.is_valid(start_row, start_col):
                     print("Error: Starting position out of bounds! Try again.")
@@ -239,7 +331,10 @@ class Pathfinder:                                   # class for the pathfinder w
                 print("Error: Invalid number! Try again.")
                 continue
                 
-        start = (start_row, start_col)
+        return (start_row, start_col)
+
+    def find_eatery(self):
+        start = self.input_start()
         
         while True:
             print("\nSelect destination eatery:")
@@ -256,9 +351,12 @@ class Pathfinder:                                   # class for the pathfinder w
         print(f"\nFinding path from {start} to {destination_eatery.name} at {goal}...")
         
         result = self.astar_search(start, goal)
+        print(f"Time taken: {result.stats.wall_ms:.6f} ms")
+        print(f"Peak memory usage: {result.stats.peak_memory} nodes")
+        print(f"Route cache: {self.route_cache.hits} hits, {self.route_cache.misses} misses\n")
         
-        if result:
-            path, total_cost = result
+        if result.found:
+            path, total_cost = result.path, result.cost
             print(f"\nPath found! Length: {len(path)} steps")
             print("Path:", " -> ".join([f"({r},{c})" for r, c in path]))
             print(f"Total cost: {total_cost}")
@@ -266,15 +364,41 @@ class Pathfinder:                                   # class for the pathfinder w
         else:
             print("No path found!")
                 
+    def plan_food_crawl(self):
+        start = self.input_start()
+        
+        while True:
+            print("\nSelect the eateries to visit:")
+            self.list_eateries()
+            eatery_input = input("\nEnter eatery letters or names, separated by commas: ")
+            
+            chosen = [self.input_eatery(part) for part in eatery_input.split(",") if part.strip()]
+            if chosen and all(chosen):
+                break
+            else:
+                print("Error: Eatery not found! Try again.")
+                
+        return_to_start = input("Return to the starting position? (y/n): ").strip().lower() == "y"
+        print(f"\nPlanning a crawl from {start} through {len(chosen)} eateries...")
+        
+        tour = self.food_crawl(start, chosen, return_to_start)
+        print(f"Time taken: {tour.stats.wall_ms:.6f} ms")
+        print(f"Nodes expanded: {tour.stats.nodes_expanded}")
+        
+        if tour.path is not None:
+            names = [self.eateries.name_at(stop) or str(stop) for stop in tour.order]
+            print(f"\nVisiting order ({'optimal' if tour.exact else 'heuristic'}): " + " -> ".join(names))
+            print(f"Path length: {len(tour.path)} steps")
+            print(f"Total cost: {tour.cost}")
+            self.print_path_on_grid(tour.path, start, tour.path[-1])
+        else:
+            print("No path found! At least one eatery cannot be reached.")
+                
     def print_grid(self):
         print("\nCurrent Grid:")
-        print("0 = Walkable, 1 = Blocked, 2 = Eatery")
+        print("0 = Walkable, 1 = Blocked, 2 = Eatery, 3 = Stairs, 4 = Crowded, 5 = Covered")
         print("-" * 60)
-        for i, row in enumerate(self.grid):
-            print(f"Row {i:2d}: ", end="")
-            for cell in row:
-                print(f"{cell:>2}", end=" ")
-            print()
+        write_grid(self.grid, width=2, row_labels=True)
 
     def add_new_eatery(self):
         print("\nAdd New Eatery")
@@ -283,8 +407,8 @@ class Pathfinder:                                   # class for the pathfinder w
         name = input("Enter eatery name: ").strip()
 
         try:
-            row = int(input("Enter row (0–9): "))
-            col = int(input("Enter column (0–19): "))
+            row = int(input(f"Enter row (0–{self.no_of_rows - 1}): "))
+            col = int(input(f"Enter column (0–{self.no_of_cols - 1}): "))
         except ValueError:
             print("Error: Row and column must be numbers.")
             return
@@ -293,40 +417,19 @@ class Pathfinder:                                   # class for the pathfinder w
             print("Error: Coordinates out of grid bounds.")
             return
 
-        if self.grid[row][col] == 1:
+        if self.grid.get(row, col) == BLOCKED:
             print("Error: Cannot place eatery on a blocked cell (1).")
             return
 
-        self.grid[row][col] = 2
-
-        existing_keys = set(self.eateries.keys())
-        next_letter = None
-
-        for letter in string.ascii_uppercase:
-            if letter not in existing_keys:
-                next_letter = letter
-                break
-
-        if next_letter is None:
-            for first in string.ascii_uppercase:
-                for second in string.ascii_uppercase:
-                    combo = first + second
-                    if combo not in existing_keys:
-                        next_letter = combo
-                        break
-                if next_letter:
-                    break
-
-        if next_letter is None:
-            print("Error: All letter keys from A to ZZ are used up.")
-            return
-
-        new_eatery = Eatery(name, row, col)
-        self.eateries[next_letter] = new_eatery
-        self.eateries_data.append((name, row, col))
-
+        next_letter = self.add_eatery(name, row, col)
         print(f"Successfully added {name} at ({row}, {col}) as {next_letter}.")
 
+    def add_eatery(self, name, row, col):          # marks the cell as an eatery and registers it; returns its letter key
+        self.grid.set(row, col, EATERY)
+        key = self.eateries.add(name, row, col)
+        self.distance_table.add_target((row, col))
+        return key
+
 
     def remove_eatery(self):
         print("\nRemove Eatery")
@@ -348,11 +451,9 @@ class Pathfinder:                                   # class for the pathfinder w
             target_eatery = self.eateries[target_key]
         else:
             # Else check if eatery exist for name input
-            for key, eatery in self.eateries.items():
-                if eatery_input.lower() in eatery.name.lower():
-                    target_key = key
-                    target_eatery = eatery
-                    break
+            target_key = self.eateries.find(eatery_input)
+            if target_key:
+                target_eatery = self.eateries[target_key]
 
         if not target_eatery:
             print("Error: Eatery not found!")
@@ -364,19 +465,24 @@ class Pathfinder:                                   # class for the pathfinder w
             print("Cancelled.")
             return
 
-        # Remove from grid
-        self.grid[target_eatery.row][target_eatery.col] = 0
+        self.delete_eatery(target_key)
+        print(f"'{target_eatery.name}' has been removed successfully.")
 
-        # Remove from dictionary
-        del self.eateries[target_key]
+    def delete_eatery(self, key):                   # forgets the eatery and clears its cell unless another eatery shares it; returns the removed Eatery
+        eatery = self.eateries[key]
+        position = (eatery.row, eatery.col)
 
-        # Remove from eateries_data
-        self.eateries_data = [
-            data for data in self.eateries_data
-            if not (data[0] == target_eatery.name and data[1] == target_eatery.row and data[2] == target_eatery.col)
-        ]
+        # Remove from registry
+        self.eateries.remove(key)
+        self.distance_table.remove_target(position)
 
-        print(f"'{target_eatery.name}' has been removed successfully.")
+        # Remove from grid, once no registered eatery is left on the cell
+        if not self.eateries.at(position):
+            self.grid.set(eatery.row, eatery.col, WALKABLE)
+            planner = self.planners.pop(position, None)
+            if planner is not None:
+                planner.close()
+        return eatery
 
 def print_menu():
     print("-" * 15)
@@ -385,10 +491,11 @@ def print_menu():
     print("3 - List all eateries")
     print("4 - Add new eatery")
     print("5 - Remove eatery")
-    print("6 - Back")
+    print("6 - Plan a food crawl")
+    print("7 - Back")
     print("-" * 15)
     
-    choice = input("\nEnter a number from 1-6: ").strip()
+    choice = input("\nEnter a number from 1-7: ").strip()
     
     return choice
 
@@ -414,7 +521,9 @@ def run_astar():
         elif user_choice == "5":
             pathfinder.remove_eatery()
         elif user_choice == "6":
+            pathfinder.plan_food_crawl()
+        elif user_choice == "7":
             print("Returning to main menu...")
             break
         else:
-            print("Invalid choice! Please enter a number from 1-6.")
+            print("Invalid choice! Please enter a number from 1-7.")
@@ -0,0 +1,144 @@
+import functools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from astar import Pathfinder
+from blindsearch import BlindSearch
+from campusmap import CampusMap, default_map
+from grid import Grid, Position
+from profiling import PhaseProfile
+from stats import SearchResult
+
+ALGORITHMS = ("astar", "ucs", "jps", "bi-astar", "bi-ucs", "hpa", "dstar", "alt", "ara")
+
+RouteQuery = Tuple[Position, Position]
+
+class BadQuery(NamedTuple):
+    # stands in for an input line that could not be parsed, so it gets an error result instead of ending the stream
+    line: int
+    error: str
+
+class RouteResult(NamedTuple):
+    index: int                                      # position of the query in the input stream
+    start: Optional[Position]                       # None for a BadQuery
+    goal: Optional[Position]
+    cost: Optional[int]                             # None when there is no path
+    path: List[Position]
+    stats: Dict                                     # SearchStats.as_dict(); empty for rejected queries
+    error: Optional[str] = None
+
+_worker = None                                      # per-process (grid, router) built once by the pool initializer
+
+def make_router(algo: str, grid: Grid, cache_size: int = 1024,
+                profile: Optional[PhaseProfile] = None) -> Callable[[Position, Position], SearchResult]:
+    # cache_size bounds the astar/ucs route caches; 0 makes every query search
+    campus_map = CampusMap.from_grid(grid)
+    return bind_router(algo, Pathfinder(campus_map, cache_size), BlindSearch(campus_map, cache_size), profile)
+
+def bind_router(algo: str, pathfinder: Pathfinder, blind_search: BlindSearch,
+                profile: Optional[PhaseProfile] = None) -> Callable[[Position, Position], SearchResult]:
+    # picks the engine method for algo from engines that already share one map;
+    # profile collects phase timers from the engines with instrumented loops (astar, ucs) and is ignored by the rest
+    if profile is not None and algo in ("astar", "ucs"):
+        search = pathfinder.astar_search if algo == "astar" else blind_search.uniform_cost_search
+        return functools.partial(search, profile=profile)
+    if algo == "astar":
+        return pathfinder.astar_search
+    if algo == "jps":
+        return pathfinder.jps_route
+    if algo == "alt":
+        return pathfinder.landmark_route
+    if algo == "ara":
+        return pathfinder.anytime_route
+    if algo == "dstar":
+        return pathfinder.incremental_route
+    if algo == "hpa":
+        return pathfinder.hierarchical_route
+    if algo == "ucs":
+        return blind_search.uniform_cost_search
+    if algo == "bi-astar":
+        return pathfinder.bidirectional_route
+    if algo == "bi-ucs":
+        return blind_search.bidirectional_search
+    raise ValueError(f"Unknown algorithm '{algo}'. Choose from: {', '.join(ALGORITHMS)}.")
+
+def solve(grid: Grid, router, index: int, start: Position, goal: Position) -> RouteResult:
+    if isinstance(start, BadQuery):
+        return RouteResult(index, None, None, None, [], {}, f"line {start.line}: {start.error}")
+    for label, (row, col) in (("start", start), ("goal", goal)):
+        if not grid.in_bounds(row, col):
+            return RouteResult(index, start, goal, None, [], {}, f"{label} out of bounds")
+        if not grid.is_open(grid.cell_id(row, col)):
+            return RouteResult(index, start, goal, None, [], {}, f"{label} is blocked")
+
+    try:
+        result = router(start, goal)
+    except ValueError as error:                     # e.g. JPS or HPA* on a weighted grid
+        return RouteResult(index, start, goal, None, [], {}, str(error))
+    return RouteResult(index, start, goal, result.cost, result.path or [], result.stats.as_dict())
+
+def _init_worker(algo: str, rows: int, cols: int, cells: bytes, step_costs: Dict[int, int]):
+    global _worker
+    grid = Grid(rows, cols, bytearray(cells), step_costs)
+    _worker = grid, make_router(algo, grid)
+
+def _solve_chunk(chunk: List[Tuple[int, Position, Position]]) -> List[RouteResult]:
+    grid, router = _worker
+    return [solve(grid, router, index, start, goal) for index, start, goal in chunk]
+
+def _chunks(queries: Iterable[RouteQuery], chunk_size: int) -> Iterator[List[Tuple[int, Position, Position]]]:
+    # a BadQuery travels in the start slot and solve() turns it into an error result
+    numbered = ((index, query, None) if isinstance(query, BadQuery) else (index, tuple(query[0]), tuple(query[1]))
+                for index, query in enumerate(queries))
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def route_batch(queries: Iterable[Union[RouteQuery, BadQuery]], algo: str = "astar", grid: Optional[Grid] = None,
+                workers: Optional[int] = None, chunk_size: int = 64,
+                max_pending: Optional[int] = None, profile: Optional[PhaseProfile] = None) -> Iterator[RouteResult]:
+    """Routes every (start, goal) pair and yields results as they complete.
+
+    Each result carries the search's SearchStats as a plain dict (wall time,
+    expansions, heap traffic, frontier and closed-set peaks). The grid is sent
+    to each worker process once through the pool initializer;
+    tasks only carry their query chunk. Queries are read lazily, with at most
+    max_pending chunks in flight, so the input can be an unbounded stream.
+    workers=0 runs everything in the calling process, which profile (phase
+    timers for astar and ucs) requires.
+    """
+    grid = grid if grid is not None else default_map().grid
+    if algo not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algo}'. Choose from: {', '.join(ALGORITHMS)}.")
+    if profile is not None and workers != 0:
+        raise ValueError("Profiling collects timers in this process; use workers=0.")
+
+    if workers == 0:
+        router = make_router(algo, grid, profile=profile)
+        for chunk in _chunks(queries, chunk_size):
+            for index, start, goal in chunk:
+                yield solve(grid, router, index, start, goal)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    limit = max_pending or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(algo, grid.rows, grid.cols, bytes(grid.cells), grid.step_costs)) as pool:
+        chunks = _chunks(queries, chunk_size)
+        pending = set()
+
+        for chunk in chunks:
+            pending.add(pool.submit(_solve_chunk, chunk))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
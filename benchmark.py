@@ -0,0 +1,139 @@
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+from batch import ALGORITHMS, make_router
+from grid import BLOCKED, CROWDED, EATERY, STAIRS, Grid, Position
+
+def generate_grid(rows: int, cols: int, density: float, eateries: int, seed: int, weighted: float = 0.0) -> Grid:
+    # seeded random obstacles, then weighted terrain and eateries dropped on open cells
+    rnd = random.Random(seed)
+    cells = bytearray(BLOCKED if rnd.random() < density else 0 for _ in range(rows * cols))
+    open_cells = [cell for cell in range(rows * cols) if cells[cell] != BLOCKED]
+    if weighted:
+        for cell in rnd.sample(open_cells, int(weighted * len(open_cells))):
+            cells[cell] = rnd.choice((STAIRS, CROWDED))
+    for cell in rnd.sample(open_cells, min(eateries, len(open_cells))):
+        cells[cell] = EATERY
+    return Grid(rows, cols, cells)
+
+def generate_queries(grid: Grid, count: int, seed: int) -> List[Sequence[Position]]:
+    # random open start cell to random eatery, the shape of our production traffic
+    rnd = random.Random(seed + 1)
+    open_cells = [cell for cell in range(grid.size) if grid.cells[cell] != BLOCKED]
+    eateries = [cell for cell in open_cells if grid.cells[cell] == EATERY] or open_cells
+    return [(grid.position(rnd.choice(open_cells)), grid.position(rnd.choice(eateries))) for _ in range(count)]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    # rounding first keeps float noise (e.g. 0.07 * 100 = 7.000000000000001) from pushing the rank up by one
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(round(fraction * len(sorted_values), 9)) - 1))
+    return sorted_values[rank]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 0.50),
+        "p90": percentile(ordered, 0.90),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+def bench_engine(algo: str, grid: Grid, queries: List[Sequence[Position]], memory_queries: int,
+                 cache_size: int = 0) -> Dict:
+    router = make_router(algo, grid, cache_size)    # no route cache by default, so every query is a real search
+    try:
+        router(*queries[0])                         # warm-up: lets lazily built indexes (e.g. HPA clusters) exist first
+    except ValueError as error:                     # engine does not support this grid (e.g. JPS on weighted terrain)
+        return {"error": str(error)}
+
+    latencies, expanded, frontiers, costs = [], [], [], []
+    found = 0
+    total_start = time.perf_counter()
+    for start, goal in queries:
+        query_start = time.perf_counter()
+        result = router(start, goal)
+        latencies.append((time.perf_counter() - query_start) * 1000)
+        expanded.append(result.stats.nodes_expanded)
+        frontiers.append(result.stats.peak_frontier)
+        if result.found:
+            found += 1
+            costs.append(result.cost)
+    total_seconds = time.perf_counter() - total_start
+
+    # memory is measured in a separate pass because tracemalloc slows every allocation down
+    tracemalloc.start()
+    peak_bytes = 0
+    for start, goal in queries[:memory_queries]:
+        tracemalloc.reset_peak()
+        router(start, goal)
+        peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    return {
+        "queries": len(queries),
+        "found": found,
+        "total_cost": sum(costs),
+        "latency_ms": summarize(latencies),
+        "throughput_qps": len(queries) / total_seconds if total_seconds else 0.0,
+        "nodes_expanded": summarize(expanded),
+        "peak_frontier": summarize(frontiers),
+        "tracemalloc_peak_bytes": peak_bytes,
+    }
+
+def run_benchmark(rows: int, cols: int, density: float, eateries: int, queries: int, seed: int,
+                  engines: Sequence[str], memory_queries: Optional[int] = None, weighted: float = 0.0,
+                  cache_size: int = 0) -> Dict:
+    grid = generate_grid(rows, cols, density, eateries, seed, weighted)
+    query_set = generate_queries(grid, queries, seed)
+    memory_queries = len(query_set) if memory_queries is None else memory_queries
+
+    return {
+        "config": {"rows": rows, "cols": cols, "density": density, "eateries": eateries,
+                   "queries": queries, "seed": seed, "memory_queries": memory_queries,
+                   "weighted": weighted, "cache_size": cache_size},
+        "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                        "machine": platform.machine()},
+        "engines": {algo: bench_engine(algo, grid, query_set, memory_queries, cache_size) for algo in engines},
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Seeded benchmark of the pathfinding engines")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--density", type=float, default=0.25, help="fraction of blocked cells")
+    parser.add_argument("--weighted", type=float, default=0.0,
+                        help="fraction of open cells turned into stairs or crowded floor")
+    parser.add_argument("--eateries", type=int, default=22)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--engines", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument("--memory-queries", type=int, default=None,
+                        help="queries re-run under tracemalloc (default: all of them)")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="route cache entries for the astar/ucs engines (default 0: always search)")
+    parser.add_argument("--output", default="-", help="JSON report file, or - for stdout (default)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = run_benchmark(args.rows, args.cols, args.density, args.eateries, args.queries,
+                           args.seed, args.engines, args.memory_queries, args.weighted, args.cache_size)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        with open(args.output, "w") as out:
+            out.write(text + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional
+
+from grid import Grid, Position, trace_parents
+from stats import ExpandHook, SearchResult, SearchStats
+
+def bidirectional_search(grid: Grid, start: Position, goal: Position, use_heuristic: bool = True,
+                         on_expand: Optional[ExpandHook] = None) -> SearchResult:
+    """Searches from start and goal at once and stops once the best meeting is proven optimal.
+
+    Without a heuristic this is bidirectional uniform cost search, which stops when
+    the two smallest open g values add up to the best meeting cost. With the
+    Manhattan heuristic (front-to-end A*) it stops when either side's smallest f
+    reaches that cost. The side with the smaller open list is expanded next.
+    Frontier and memory peaks in the stats count both sides together.
+
+    A step costs the cell it enters, so the backward side charges the cell it
+    expands from rather than the neighbor it reaches.
+    """
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    cols = grid.cols
+    cells, costs, min_cost = grid.cells, grid.costs, grid.min_cost
+    start_cell = grid.cell_id(*start)
+    goal_cell = grid.cell_id(*goal)
+    counter = itertools.count()
+
+    def heuristic(cell: int, target: Position) -> int:
+        if not use_heuristic:
+            return 0
+        row, col = divmod(cell, cols)
+        return (abs(row - target[0]) + abs(col - target[1])) * min_cost
+
+    # index 0 searches forward from start towards goal, index 1 backward from goal towards start
+    targets = (goal, start)
+    # entries are (f, h, g, counter, cell): f-ties go to the lower h, as in astar_search
+    start_h, goal_h = heuristic(start_cell, goal), heuristic(goal_cell, start)
+    open_lists = [[(start_h, start_h, 0, next(counter), start_cell)],
+                  [(goal_h, goal_h, 0, next(counter), goal_cell)]]
+    g_costs: List[Dict[int, int]] = [{start_cell: 0}, {goal_cell: 0}]
+    parents: List[Dict[int, Optional[int]]] = [{start_cell: None}, {goal_cell: None}]
+    closed = [set(), set()]
+    expanded = [0, 0]
+
+    best_cost = 0 if start_cell == goal_cell else None
+    meeting = start_cell if start_cell == goal_cell else None
+    stats.heap_pushes = 2
+
+    while open_lists[0] and open_lists[1]:
+        frontier = len(open_lists[0]) + len(open_lists[1])
+        stats.peak_frontier = max(stats.peak_frontier, frontier)
+        stats.peak_memory = max(stats.peak_memory, frontier + len(closed[0]) + len(closed[1]))
+
+        if best_cost is not None:
+            forward_min = open_lists[0][0][0]
+            backward_min = open_lists[1][0][0]
+            if use_heuristic:
+                if best_cost <= max(forward_min, backward_min):
+                    break
+            elif best_cost <= forward_min + backward_min:
+                break
+
+        side = 0 if len(open_lists[0]) <= len(open_lists[1]) else 1
+        _, _, g, _, cell = heapq.heappop(open_lists[side])
+        if cell in closed[side] or g > g_costs[side][cell]:
+            stats.stale_pops += 1
+            continue
+        closed[side].add(cell)
+        expanded[side] += 1
+        if on_expand is not None:
+            on_expand(grid.position(cell), g)
+
+        own_g = g_costs[side]
+        other_g = g_costs[1 - side]
+        backward_step = g + costs[cells[cell]]
+        for neighbor in grid.neighbors(cell):
+            if neighbor in closed[side]:
+                continue
+            stats.nodes_generated += 1
+            tentative_g = g + costs[cells[neighbor]] if side == 0 else backward_step
+            if tentative_g >= own_g.get(neighbor, tentative_g + 1):
+                continue
+            own_g[neighbor] = tentative_g
+            parents[side][neighbor] = cell
+            h = heuristic(neighbor, targets[side])
+            heapq.heappush(open_lists[side], (tentative_g + h, h, tentative_g, next(counter), neighbor))
+            stats.heap_pushes += 1
+            if neighbor in other_g and (best_cost is None or tentative_g + other_g[neighbor] < best_cost):
+                best_cost = tentative_g + other_g[neighbor]
+                meeting = neighbor
+
+    stats.forward_expanded, stats.backward_expanded = expanded
+    stats.nodes_expanded = expanded[0] + expanded[1]
+    stats.peak_closed = len(closed[0]) + len(closed[1])
+
+    path = None
+    if meeting is not None:
+        forward_half = trace_parents(grid, parents[0], meeting)
+        backward_half = trace_parents(grid, parents[1], meeting)
+        path = forward_half + backward_half[-2::-1]
+    stats.wall_ms = (time.perf_counter() - start_time) * 1000
+    return SearchResult(path, best_cost, stats)
@@ -1,119 +1,148 @@
 import heapq
 import time
-from typing import List, Tuple
-
-# Constants
-WALKABLE = 0
-BLOCKED = 1
-EATERY = 2
-
-Grid = List[List[int]]
-Position = Tuple[int, int]
+from typing import Dict, List, Optional, Tuple
+
+from bidirectional import bidirectional_search
+from campusmap import CampusMap, default_map
+from distcache import DistanceTable
+from grid import BLOCKED, EATERY, WALKABLE, Grid, Position, trace_parents
+from nearest import multi_goal_search
+from profiling import HEAP, NEIGHBORS, TRACE, VISITED, PhaseProfile
+from registry import EateryRegistry
+from render import MARKERS, route_viewport, write_grid
+from routecache import RouteCache
+from stats import ExpandHook, SearchResult, SearchStats
 
 class BlindSearch:
-    def __init__(self):
+    def __init__(self, campus_map: Optional[CampusMap] = None, cache_size: int = 1024):
+        self.campus_map = campus_map if campus_map is not None else default_map()
         self.grid = self.initialize_grid()
-        self.rows = len(self.grid)
-        self.cols = len(self.grid[0])
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
         self.landmarks = self.define_landmarks()
+        self.registry = EateryRegistry((name, row, col) for name, (row, col) in self.landmarks.items())
+        self.distance_table = DistanceTable(self.grid, self.landmarks.values())
+        self.distance_table.preload(self.campus_map.indexes.get("distance", {}))   # fields shipped in a snapshot
+        self.route_cache = RouteCache(cache_size)  # repeated uniform_cost_search queries on an unchanged grid
 
     def initialize_grid(self) -> Grid:
-        return [                 # 0 - walkable, 1 - blocked, 2 - eatery
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 2, 2, 1, 1, 1, 1, 1, 2, 0, 1, 2, 2, 0, 1, 2, 1, 2],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1],
-            [1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1],
-            [1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 1, 1, 1, 0, 1, 1, 1, 0, 1, 1],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [1, 1, 1, 2, 2, 2, 0, 2, 1, 2, 2, 1, 0, 0, 0, 0, 0, 0, 2, 2],
-            [0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0],
-            [1, 1, 1, 1, 2, 2, 1, 2, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 0, 0],
-        ]
-
-    def define_landmarks(self):
-        return {
-            "University Mall": (7, 19),
-            "McDonald's": (7, 18),
-            "Perico's": (8, 17),
-            "Bloemen Hall": (9, 11),
-            "WH Taft Residence": (7, 10),
-            "EGI Taft": (7, 9),
-            "Castro Street": (7, 7),
-            "Agno Food Court": (9, 7),
-            "One Archer's": (7, 5),
-            "La Casita 1": (7, 4),
-            "La Casita 2": (9, 4),
-            "Green Mall": (7, 3),
-            "Green Court": (9, 5),
-            "Sherwood": (1, 3),
-            "Jollibee": (1, 4),
-            "Dagonoy Street": (1, 10),
-            "Burgundy": (1, 13),
-            "Estrada Street": (1, 14),
-            "D'Student's Place": (1, 17),
-            "Leon Guinto Street": (0, 13),
-            "P. Ocampo Street": (1, 19),
-            "Fidel A. Reyes Street": (8, 1),
-        }
+        return self.campus_map.grid
 
-    def is_valid(self, x: int, y: int) -> bool:
-        return 0 <= x < self.rows and 0 <= y < self.cols and self.grid[x][y] != BLOCKED
+    def define_landmarks(self) -> Dict[str, Position]:
+        return {name: (row, col) for name, row, col in self.campus_map.eateries}
 
-    def uniform_cost_search(self, start: Position, goal: Position) -> Tuple[List[Position], int]:
+    def is_valid(self, x: int, y: int) -> bool:
+        return 0 <= x < self.rows and 0 <= y < self.cols and self.grid.get(x, y) != BLOCKED
+
+    def uniform_cost_search(self, start: Position, goal: Position, on_expand: Optional[ExpandHook] = None,
+                            profile: Optional[PhaseProfile] = None) -> SearchResult:
+        start_time = time.perf_counter()
+        cache_key = version = None
+        if on_expand is None and profile is None: # hooked or profiled runs always search
+            cache_key, version = ("ucs", tuple(start), tuple(goal)), self.grid.version
+            cached = self.route_cache.get(cache_key, version)
+            if cached is not None:
+                cached.stats.wall_ms = (time.perf_counter() - start_time) * 1000
+                return cached
+
+        stats = SearchStats()
+        grid = self.grid
+        cells, costs = grid.cells, grid.costs
+        start_cell = grid.cell_id(*start)
+        goal_cell = grid.cell_id(*goal)
         visited = set()
-        queue = [(0, start, [start])]
-        heapq.heapify(queue)
+        parent = {}  # maps each expanded cell to the cell it was reached from
+        queue = [(0, start_cell, None)]
         nodes_expanded = 0  # keeps track of nodes processed
         max_queue_size = 1 # keeps track of the maximum size of the priority queue
+        heap_pushes = 1
+        stale_pops = 0
+        path = total_cost = None
+        lap = None # bound once so unprofiled runs pay a single local check per phase
+        if profile is not None:
+            lap = profile.lap
+            profile.start()
 
         while queue:
             max_queue_size = max(max_queue_size, len(queue)) # tracks the maximum size the queue has reached
-            cost, current, path = heapq.heappop(queue) # pops the node with the lowest path cost
+            cost, current, previous = heapq.heappop(queue) # pops the node with the lowest path cost
+            if lap:
+                lap(HEAP)
             if current in visited: # skip node if visited already
+                stale_pops += 1
+                if lap:
+                    lap(VISITED)
                 continue
             visited.add(current) # marks current node as visited
+            parent[current] = previous
             nodes_expanded += 1
+            if lap:
+                lap(VISITED)
+            if on_expand is not None:
+                on_expand(grid.position(current), cost)
+
+            if current == goal_cell:
+                path, total_cost = trace_parents(grid, parent, goal_cell), cost
+                if lap:
+                    lap(TRACE)
+                break
 
-            if current == goal:
-                self.memory_used = max_queue_size + len(visited) 
-                return path, nodes_expanded
-
-            x, y = current
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nx, ny = x + dx, y + dy # coordinates of neighboring tiles
-                if self.is_valid(nx, ny) and (nx, ny) not in visited:
-                    heapq.heappush(queue, (cost + 1, (nx, ny), path + [(nx, ny)]))  # adds the valid neighbor into the priority queue
-
-        self.memory_used = max_queue_size + len(visited) 
-        return [], nodes_expanded
-
-    def compute_memory_complexity(self):
-        return self.memory_used
-
-    def print_grid_with_path(self, path: List[Position], start: Position, goal: Position):
+            for neighbor in grid.neighbors(current): # open neighboring tiles
+                if neighbor not in visited:
+                    if lap:
+                        lap(NEIGHBORS)
+                    heapq.heappush(queue, (cost + costs[cells[neighbor]], neighbor, current))  # step cost is the cost of the tile entered
+                    heap_pushes += 1
+                    if lap:
+                        lap(HEAP)
+            if lap:
+                lap(NEIGHBORS)
+
+        stats.wall_ms = (time.perf_counter() - start_time) * 1000
+        stats.nodes_expanded = nodes_expanded
+        stats.nodes_generated = heap_pushes - 1
+        stats.heap_pushes = heap_pushes
+        stats.stale_pops = stale_pops
+        stats.peak_frontier = max_queue_size
+        stats.peak_closed = len(visited)
+        stats.peak_memory = max_queue_size + len(visited) # peak memory usage: visited + frontier (max)
+        result = SearchResult(path, total_cost, stats)
+        if cache_key is not None:
+            self.route_cache.put(cache_key, version, result)
+        return result
+
+    def bidirectional_search(self, start: Position, goal: Position,
+                             on_expand: Optional[ExpandHook] = None) -> SearchResult:
+        # uniform cost search from both ends; stats carry nodes expanded in each direction
+        return bidirectional_search(self.grid, start, goal, use_heuristic=False, on_expand=on_expand)
+
+    def landmark_route(self, start: Position, goal: Position) -> Optional[Tuple[List[Position], int]]:
+        # precomputed distance field lookup for a landmark goal: (path, cost), or None when it cannot be reached,
+        # like Pathfinder.eatery_route
+        return self.distance_table.route(start, goal)
+
+    def nearest_landmarks(self, start: Position, k: int = 1) -> Tuple[List[Tuple[str, List[Position], int]], int]:
+        # one uniform cost expansion that stops once the k closest landmarks are settled
+        at_position: Dict[Position, List[str]] = {}
+        for name, position in self.landmarks.items():
+            at_position.setdefault(position, []).append(name)
+
+        found, nodes_expanded = multi_goal_search(self.grid, start, at_position.keys(), k, use_heuristic=False)
+        ranked = [(name, path, cost) for position, path, cost in found for name in at_position[position]]
+        return ranked[:k], nodes_expanded
+
+    def print_grid_with_path(self, path: List[Position], start: Position, goal: Position,
+                             margin: Optional[int] = None):
+        # margin crops the view to the route's bounding box plus that many cells
         print("\nGrid View:")
-        for i in range(self.rows):
-            row = ""
-            for j in range(self.cols):
-                if (i, j) == start:
-                    row += "S "
-                elif (i, j) == goal:
-                    row += "G "
-                elif (i, j) in path:
-                    row += "* "
-                elif self.grid[i][j] == BLOCKED:
-                    row += "X "
-                elif self.grid[i][j] == EATERY:
-                    row += "E "
-                else:
-                    row += ". "
-            print(row)
-
-    def print_path_summary(self, path: List[Position], start: Position, goal: Position, nodes_expanded: int):
+        viewport = route_viewport(self.grid, path, margin) if margin is not None and path else None
+        write_grid(self.grid, path, start, goal, symbols=MARKERS, viewport=viewport)
+
+    def print_path_summary(self, result: SearchResult, start: Position, goal: Position):
+        path = result.path
         print("\nRunning Uniform Cost Search . . .")
-        start_name = next((name for name, pos in self.landmarks.items() if pos == start), f"{start}")
-        goal_name = next((name for name, pos in self.landmarks.items() if pos == goal), f"{goal}")
+        start_name = self.registry.name_at(start) or f"{start}"
+        goal_name = self.registry.name_at(goal) or f"{goal}"
 
         print(f"From: {start_name} ➜ {goal_name}")
         print("------------------------------------")
@@ -124,14 +153,14 @@ class BlindSearch:
 
         readable_path = []
         for pos in path:
-            name = next((label for label, location in self.landmarks.items() if location == pos), None)
+            name = self.registry.name_at(pos)
             readable_path.append(name if name else f"{pos}")
 
         print("\nPATH FOUND!")
         print("Nodes Visited: " + " ➜ ".join(readable_path))
-        print(f"Total Cost: {len(path) - 1}")
-        print(f"Nodes Expanded: {nodes_expanded}") # nodes removed from queue & processed
-        print(f"Memory Used (approx): {self.compute_memory_complexity()} nodes") # peak memory usage: visited + frontier (max)
+        print(f"Total Cost: {result.cost}")
+        print(f"Nodes Expanded: {result.stats.nodes_expanded}") # nodes removed from queue & processed
+        print(f"Memory Used (approx): {result.stats.peak_memory} nodes") # peak memory usage: visited + frontier (max)
 
     def show_landmark_menu(self):
         print("\nDLSU FOOD MAP:")
@@ -168,8 +197,8 @@ class BlindSearch:
 
                 while True:
                     try:
-                        sx = int(input("Enter START row (0-9): "))
-                        sy = int(input("Enter START column (0-19): "))
+                        sx = int(input(f"Enter START row (0-{self.rows - 1}): "))
+                        sy = int(input(f"Enter START column (0-{self.cols - 1}): "))
                         start = (sx, sy)
 
                         # START must be WALKABLE or EATERY
@@ -181,7 +210,7 @@ class BlindSearch:
                         goal_name, goal = self.get_landmark_by_index(goal_index)
 
                         # GOAL must be EATERY
-                        if not self.is_valid(*goal) or self.grid[goal[0]][goal[1]] != EATERY:
+                        if not self.is_valid(*goal) or self.grid.get(*goal) != EATERY:
                             print("\nInvalid GOAL: Must be EATERY. Try again.\n")
                             continue
                         break
@@ -190,26 +219,29 @@ class BlindSearch:
                         print("Invalid input. Please enter correct coordinates and valid eatery index.")
 
                 # Run search after valid input
-                start_time = time.perf_counter()
-                path, nodes = self.uniform_cost_search(start, goal)
-                end_time = time.perf_counter()
+                result = self.uniform_cost_search(start, goal)
 
-                self.print_path_summary(path, start, goal, nodes)
-                elapsed_ms = (end_time - start_time) * 1000
-                print(f"Time taken: {elapsed_ms:.6f} ms")
-                self.print_grid_with_path(path, start, goal)
+                self.print_path_summary(result, start, goal)
+                print(f"Time taken: {result.stats.wall_ms:.6f} ms")
+                print(f"Route cache: {self.route_cache.hits} hits, {self.route_cache.misses} misses")
+                self.print_grid_with_path(result.path or [], start, goal)
 
 
             elif choice == '2':
                 try:
                     name = input("Enter new eatery name: ").strip()
-                    x = int(input("Enter row (0-9): "))
-                    y = int(input("Enter column (0-19): "))
+                    x = int(input(f"Enter row (0-{self.rows - 1}): "))
+                    y = int(input(f"Enter column (0-{self.cols - 1}): "))
                     if not (0 <= x < self.rows and 0 <= y < self.cols):
                         print("Invalid position.")
                     else:
-                        self.grid[x][y] = EATERY
+                        if name in self.landmarks:
+                            self.distance_table.remove_target(self.landmarks[name])
+                            self.registry.remove(self.registry.named(name)[0])
+                        self.grid.set(x, y, EATERY)
                         self.landmarks[name] = (x, y)
+                        self.registry.add(name, x, y)
+                        self.distance_table.add_target((x, y))
                         print(f"Added '{name}' at position ({x}, {y}) as an eatery.")
                 except ValueError:
                     print("Invalid input.")
@@ -219,17 +251,20 @@ class BlindSearch:
                 try:
                     index = int(input("Enter index of eatery to remove: "))
                     name = list(self.landmarks.keys())[index]
-                    del self.landmarks[name]
+                    self.distance_table.remove_target(self.landmarks.pop(name))
+                    self.registry.remove(self.registry.named(name)[0])
                     print(f"Removed '{name}' from landmarks.")
                 except (ValueError, IndexError):
                     print("Invalid selection.")
 
             elif choice == '4':
                 try:
-                    x = int(input("Enter row (0-9): "))
-                    y = int(input("Enter column (0-19): "))
-                    if self.grid[x][y] == BLOCKED:
-                        self.grid[x][y] = WALKABLE
+                    x = int(input(f"Enter row (0-{self.rows - 1}): "))
+                    y = int(input(f"Enter column (0-{self.cols - 1}): "))
+                    if not (0 <= x < self.rows and 0 <= y < self.cols):
+                        print("Invalid position.")
+                    elif self.grid.get(x, y) == BLOCKED:
+                        self.grid.set(x, y, WALKABLE)
                         print(f"Tile at ({x}, {y}) is now walkable.")
                     else:
                         print("Tile is already walkable or special.")
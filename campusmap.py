@@ -0,0 +1,307 @@
+import csv
+import io
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from grid import EATERY, Grid
+from registry import key_for
+
+EateryRecord = Tuple[str, int, int]                 # (name, row, col)
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps")
+DEFAULT_MAP = os.path.join(MAPS_DIR, "dlsu.txt")
+
+# binary layout: header, then rows * cols cell bytes, then one record per eatery
+BINARY_MAGIC = b"CMAP"
+BINARY_VERSION = 1
+HEADER = struct.Struct("<4sHHIII")                  # magic, version, reserved, rows, cols, eatery count
+EATERY_RECORD = struct.Struct("<IIH")               # row, col, name length in bytes (UTF-8 name follows)
+
+# snapshot layout: header, section table, then 8-byte aligned sections; the CRC-32 covers everything after the header
+SNAPSHOT_MAGIC = b"CSNP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sHHIIII")        # magic, version, reserved, rows, cols, section count, CRC-32
+SECTION = struct.Struct("<4sIQQ")                   # tag, item count, offset, length in bytes
+KEYED_RECORD = struct.Struct("<IIHH")               # row, col, key length, name length (key then name follow, UTF-8)
+
+class CampusMap:
+    """A grid plus its named eateries, as loaded from a map file."""
+
+    def __init__(self, grid: Grid, eateries: List[EateryRecord], source: Optional[str] = None):
+        self.grid = grid
+        self.eateries = eateries
+        self.source = source
+        self.keys: Optional[List[str]] = None       # registry key per eatery record, when not simply A, B, C, ...
+        self.indexes: Dict = {}                     # precomputed search indexes loaded from a snapshot
+        self._mapping = None                        # keeps an mmap'd file alive while the grid points into it
+        self._views: List[memoryview] = []          # index views into the mapping, released on close
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "CampusMap":
+        # names every EATERY cell after its position, for generated or hand-built grids
+        eateries = [(f"Eatery ({cell // grid.cols}, {cell % grid.cols})", cell // grid.cols, cell % grid.cols)
+                    for cell in range(grid.size) if grid.cells[cell] == EATERY]
+        return cls(grid, eateries)
+
+    def close(self):
+        if self._mapping is not None:
+            for view in self._views:
+                view.release()
+            self._views = []
+            self.grid.release()
+            self._mapping.close()
+            self._mapping = None
+
+def default_map() -> CampusMap:
+    return load_map(DEFAULT_MAP)
+
+def load_map(path: str) -> CampusMap:
+    with open(path, "rb") as handle:
+        magic = handle.read(len(BINARY_MAGIC))
+    if magic == SNAPSHOT_MAGIC:
+        return load_snapshot(path)
+    return load_binary_map(path) if magic == BINARY_MAGIC else load_text_map(path)
+
+def load_text_map(path: str) -> CampusMap:
+    with open(path, newline="", encoding="utf-8") as handle:
+        campus_map = parse_text_map(handle.read())
+    campus_map.source = path
+    return campus_map
+
+def parse_text_map(text: str) -> CampusMap:
+    """Parses the authoring format.
+
+    [grid] lines hold one digit per cell, optionally separated by commas or spaces:
+    0 walkable, 1 blocked, 2 eatery, 3 stairs, 4 crowded floor, 5 covered walkway.
+    A step costs the cell it enters (grid.STEP_COSTS): 3 for stairs, 2 for
+    crowded floor and 1 for the other open cells. [eateries] lines are CSV:
+    name,row,col. Lines starting with # are comments.
+    """
+    section = None
+    rows: List[List[int]] = []
+    eatery_lines: List[str] = []
+    for number, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+            continue
+        if section == "grid":
+            digits = line.replace(",", "").replace(" ", "")
+            if not digits.isdigit():
+                raise ValueError(f"Line {number}: grid rows may only contain digits.")
+            rows.append([int(digit) for digit in digits])
+        elif section == "eateries":
+            eatery_lines.append(line)
+        else:
+            raise ValueError(f"Line {number}: expected a [grid] or [eateries] section header.")
+
+    if not rows:
+        raise ValueError("Map has no [grid] section.")
+    grid = Grid.from_rows(rows)
+
+    eateries = []
+    for name, row, col in csv.reader(eatery_lines):
+        if name.strip().lower() == "name":
+            continue                                # header line
+        eateries.append((name.strip(), int(row), int(col)))
+    _check_eateries(grid, eateries)
+    return CampusMap(grid, eateries)
+
+def format_text_map(campus_map: CampusMap) -> str:
+    out = io.StringIO()
+    out.write("[grid]\n")
+    for row in campus_map.grid:
+        out.write("".join(str(cell) for cell in row) + "\n")
+    out.write("\n[eateries]\n")
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["name", "row", "col"])
+    writer.writerows(campus_map.eateries)
+    return out.getvalue()
+
+def load_binary_map(path: str) -> CampusMap:
+    """Maps a binary map file into memory; the grid reads the file's pages directly.
+
+    The mapping is copy-on-write, so grid edits stay private to this process and
+    never reach the file.
+    """
+    with open(path, "rb") as handle:
+        mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, _, rows, cols, count = HEADER.unpack_from(mapping, 0)
+    if magic != BINARY_MAGIC:
+        mapping.close()
+        raise ValueError(f"{path} is not a binary campus map.")
+    if version != BINARY_VERSION:
+        mapping.close()
+        raise ValueError(f"{path} has map format version {version}; expected {BINARY_VERSION}.")
+
+    offset = HEADER.size
+    cells = memoryview(mapping)[offset:offset + rows * cols]
+    offset += rows * cols
+
+    eateries = []
+    for _ in range(count):
+        row, col, length = EATERY_RECORD.unpack_from(mapping, offset)
+        offset += EATERY_RECORD.size
+        eateries.append((bytes(mapping[offset:offset + length]).decode("utf-8"), row, col))
+        offset += length
+
+    campus_map = CampusMap(Grid(rows, cols, cells), eateries, path)
+    campus_map._mapping = mapping
+    return campus_map
+
+def save_map(campus_map: CampusMap, path: str, binary: Optional[bool] = None):
+    # format follows the extension (.bin is binary) unless binary is given
+    if binary is None:
+        binary = path.endswith(".bin")
+    if not binary:
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            handle.write(format_text_map(campus_map))
+        return
+
+    grid = campus_map.grid
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, grid.rows, grid.cols, len(campus_map.eateries)))
+        handle.write(grid.cells)
+        for name, row, col in campus_map.eateries:
+            encoded = name.encode("utf-8")
+            handle.write(EATERY_RECORD.pack(row, col, len(encoded)))
+            handle.write(encoded)
+
+def save_snapshot(campus_map: CampusMap, path: str, keys: Optional[Sequence[str]] = None, indexes: Optional[Dict] = None):
+    """Writes the grid, its step costs, the keyed eateries and any precomputed indexes.
+
+    indexes may hold "distance": {target cell: (dist, next_hop)} as DistanceTable
+    keeps them, and "landmarks": (count, anchors, fields) as LandmarkHeuristic
+    keeps them. Index arrays are stored as little-endian int32 so load_snapshot
+    can hand out views into the file instead of copies.
+    """
+    grid = campus_map.grid
+    indexes = indexes or {}
+    keys = list(keys) if keys is not None else [key_for(index) for index in range(len(campus_map.eateries))]
+    sections = [(b"CELL", grid.size, bytes(grid.cells)),
+                (b"COST", len(grid.step_costs), _int32(value for pair in sorted(grid.step_costs.items()) for value in pair))]
+
+    records = bytearray()
+    for key, (name, row, col) in zip(keys, campus_map.eateries):
+        encoded_key, encoded_name = key.encode("utf-8"), name.encode("utf-8")
+        records += KEYED_RECORD.pack(row, col, len(encoded_key), len(encoded_name)) + encoded_key + encoded_name
+    sections.append((b"EATS", len(campus_map.eateries), bytes(records)))
+
+    fields = indexes.get("distance", {})
+    if fields:
+        targets = sorted(fields)
+        data = _int32(targets) + b"".join(_int32(field[0]) + _int32(field[1]) for field in map(fields.get, targets))
+        sections.append((b"DIST", len(targets), data))
+    if indexes.get("landmarks"):
+        count, anchors, anchor_fields = indexes["landmarks"]
+        sections.append((b"LMRK", count, _int32([len(anchors)] + list(anchors)) + b"".join(map(_int32, anchor_fields))))
+
+    table_size = SECTION.size * len(sections)
+    offset = _align(SNAPSHOT_HEADER.size + table_size)
+    table, body = bytearray(), bytearray()
+    for tag, count, data in sections:
+        table += SECTION.pack(tag, count, offset, len(data))
+        body += data + bytes(_align(len(data)) - len(data))
+        offset += _align(len(data))
+    payload = bytes(table) + bytes(_align(SNAPSHOT_HEADER.size + table_size) - SNAPSHOT_HEADER.size - table_size) + bytes(body)
+
+    with open(path, "wb") as handle:
+        handle.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, grid.rows, grid.cols, len(sections),
+                                          zlib.crc32(payload)))
+        handle.write(payload)
+
+def load_snapshot(path: str, verify: bool = True) -> CampusMap:
+    """Maps a snapshot into memory; the grid and every index array are views into the file.
+
+    Like load_binary_map the mapping is copy-on-write. verify=False skips the
+    CRC-32 pass over the file, for the fastest start on trusted snapshots.
+    """
+    if sys.byteorder != "little":
+        raise ValueError("Snapshots store little-endian arrays and cannot be mapped on this machine.")
+    with open(path, "rb") as handle:
+        mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, _, rows, cols, section_count, checksum = SNAPSHOT_HEADER.unpack_from(mapping, 0)
+    problem = None
+    if magic != SNAPSHOT_MAGIC:
+        problem = f"{path} is not a campus map snapshot."
+    elif version != SNAPSHOT_VERSION:
+        problem = f"{path} has snapshot format version {version}; expected {SNAPSHOT_VERSION}."
+    elif verify and zlib.crc32(memoryview(mapping)[SNAPSHOT_HEADER.size:]) != checksum:
+        problem = f"{path} is corrupt: checksum mismatch."
+    if problem is not None:
+        mapping.close()
+        raise ValueError(problem)
+
+    view = memoryview(mapping)
+    sections = {}
+    for index in range(section_count):
+        tag, count, offset, length = SECTION.unpack_from(mapping, SNAPSHOT_HEADER.size + index * SECTION.size)
+        sections[tag] = (count, view[offset:offset + length])
+
+    costs = sections[b"COST"][1].cast("i")
+    step_costs = {costs[index]: costs[index + 1] for index in range(0, len(costs), 2)}
+    costs.release()
+    grid = Grid(rows, cols, sections[b"CELL"][1], step_costs)
+
+    count, records = sections[b"EATS"]
+    eateries, keys, offset = [], [], 0
+    for _ in range(count):
+        row, col, key_length, name_length = KEYED_RECORD.unpack_from(records, offset)
+        offset += KEYED_RECORD.size
+        keys.append(bytes(records[offset:offset + key_length]).decode("utf-8"))
+        offset += key_length
+        eateries.append((bytes(records[offset:offset + name_length]).decode("utf-8"), row, col))
+        offset += name_length
+    records.release()
+
+    campus_map = CampusMap(grid, eateries, path)
+    campus_map.keys = keys
+    campus_map._mapping = mapping
+    views = campus_map._views
+    if b"DIST" in sections:
+        count, data = sections[b"DIST"]
+        values = data.cast("i")
+        views += [data, values]
+        targets = values[:count]
+        fields = {}
+        for index, target in enumerate(targets):
+            start = count + index * 2 * grid.size
+            fields[target] = (values[start:start + grid.size], values[start + grid.size:start + 2 * grid.size])
+            views += fields[target]
+        views.append(targets)
+        campus_map.indexes["distance"] = fields
+    if b"LMRK" in sections:
+        count, data = sections[b"LMRK"]
+        values = data.cast("i")
+        views += [data, values]
+        anchor_count = values[0]
+        anchors = list(values[1:1 + anchor_count])
+        start = 1 + anchor_count
+        anchor_fields = [values[start + index * grid.size:start + (index + 1) * grid.size] for index in range(anchor_count)]
+        views += anchor_fields
+        campus_map.indexes["landmarks"] = (count, anchors, anchor_fields)
+    view.release()
+    return campus_map
+
+def _int32(values) -> bytes:
+    packed = array('i', values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+def _check_eateries(grid: Grid, eateries: List[EateryRecord]):
+    for name, row, col in eateries:
+        if not grid.in_bounds(row, col):
+            raise ValueError(f"Eatery '{name}' at ({row}, {col}) is outside the {grid.rows}x{grid.cols} grid.")
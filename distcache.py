@@ -0,0 +1,170 @@
+import heapq
+from array import array
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from grid import BLOCKED, Grid, Position
+
+UNREACHED = -1
+
+Field = Tuple[array, array]   # (distance to target, next cell towards target) per cell id
+
+class DistanceTable:
+    """Per-eatery distance fields with next-hop pointers (BFS, or Dijkstra on weighted grids).
+
+    Each field is built on the first query that needs it. On unit-cost grids,
+    edits repair a field in place when they can and only drop the fields they
+    actually change; step cost changes drop every field.
+    """
+
+    def __init__(self, grid: Grid, targets: Iterable[Position] = ()):
+        self.grid = grid
+        self.fields: Dict[int, Optional[Field]] = {}     # target cell -> field, None until built
+        self._refs = Counter()                           # several eateries may share a cell
+        self.builds = 0
+        for target in targets:
+            self.add_target(target)
+        grid.subscribe(self._on_cell_changed)
+
+    def add_target(self, target: Position):
+        cell = self.grid.cell_id(*target)
+        self._refs[cell] += 1
+        self.fields.setdefault(cell, None)
+
+    def remove_target(self, target: Position):
+        cell = self.grid.cell_id(*target)
+        if self._refs[cell] == 0:
+            return
+        self._refs[cell] -= 1
+        if self._refs[cell] == 0:
+            del self._refs[cell]
+            del self.fields[cell]
+
+    def warm(self):
+        # builds every field not built yet, e.g. before saving a snapshot
+        for cell, field in self.fields.items():
+            if field is None:
+                self.fields[cell] = self._build(cell)
+
+    def preload(self, fields: Dict[int, Field]):
+        # adopts fields built elsewhere (e.g. loaded from a snapshot) for this table's targets
+        for cell, field in fields.items():
+            if cell in self.fields:
+                self.fields[cell] = field
+
+    def distance(self, start: Position, target: Position) -> Optional[int]:
+        dist, _ = self._field(target)
+        steps = dist[self.grid.cell_id(*start)]
+        return None if steps == UNREACHED else steps
+
+    def route(self, start: Position, target: Position) -> Optional[Tuple[List[Position], int]]:
+        # walks the next-hop pointers from start; no search happens here
+        grid = self.grid
+        dist, next_hop = self._field(target)
+        cell = grid.cell_id(*start)
+        if dist[cell] == UNREACHED:
+            return None
+
+        path = [grid.position(cell)]
+        while dist[cell] > 0:
+            cell = next_hop[cell]
+            path.append(grid.position(cell))
+        return path, dist[grid.cell_id(*start)]
+
+    def _field(self, target: Position) -> Field:
+        cell = self.grid.cell_id(*target)
+        if cell not in self.fields:
+            raise KeyError(f"{target} is not a target of this table.")
+        field = self.fields[cell]
+        if field is None:
+            field = self.fields[cell] = self._build(cell)
+        return field
+
+    def _build(self, target: int) -> Field:
+        grid = self.grid
+        dist = array('i', [UNREACHED]) * grid.size
+        next_hop = array('i', [UNREACHED]) * grid.size
+        self.builds += 1
+        if not grid.is_open(target):
+            return dist, next_hop
+
+        dist[target] = 0
+        if not grid.is_uniform():
+            return self._build_weighted(target, dist, next_hop)
+        queue = deque([target])
+        while queue:
+            current = queue.popleft()
+            steps = dist[current] + 1
+            for neighbor in grid.neighbors(current):
+                if dist[neighbor] == UNREACHED:
+                    dist[neighbor] = steps
+                    next_hop[neighbor] = current
+                    queue.append(neighbor)
+        return dist, next_hop
+
+    def _build_weighted(self, target: int, dist: array, next_hop: array) -> Field:
+        # Dijkstra outwards from the target; stepping from a neighbor towards the target costs the cell stepped onto
+        grid = self.grid
+        cells, costs = grid.cells, grid.costs
+        queue = [(0, target)]
+        while queue:
+            cost, current = heapq.heappop(queue)
+            if cost > dist[current]:
+                continue
+            step = cost + costs[cells[current]]
+            for neighbor in grid.neighbors(current):
+                if dist[neighbor] == UNREACHED or step < dist[neighbor]:
+                    dist[neighbor] = step
+                    next_hop[neighbor] = current
+                    heapq.heappush(queue, (step, neighbor))
+        return dist, next_hop
+
+    def _on_cell_changed(self, cell: int, old: int, new: int):
+        was_open = old != BLOCKED
+        now_open = new != BLOCKED
+        costs = self.grid.costs
+        if was_open == now_open and costs[old] == costs[new]:   # e.g. walkable <-> eatery keeps every distance
+            return
+        if was_open == now_open or not self.grid.is_uniform():
+            # a cost change can reroute any field; the in-place repair below only knows unit steps
+            for target in self.fields:
+                self.fields[target] = None
+            return
+
+        neighbors = self._adjacent(cell)
+        for target, field in self.fields.items():
+            if field is None:
+                continue
+            if target == cell or not self._repair(field, cell, neighbors, now_open):
+                self.fields[target] = None              # rebuilt lazily on the next query
+
+    def _adjacent(self, cell: int) -> List[int]:
+        # in-bounds neighbors regardless of whether they are blocked
+        cols = self.grid.cols
+        result = [n for n in (cell - cols, cell + cols) if 0 <= n < self.grid.size]
+        if cell % cols > 0:
+            result.append(cell - 1)
+        if cell % cols < cols - 1:
+            result.append(cell + 1)
+        return result
+
+    def _repair(self, field: Field, cell: int, neighbors: List[int], opened: bool) -> bool:
+        # returns False when the edit can change distances beyond the edited cell itself
+        dist, next_hop = field
+        if not opened:
+            if any(next_hop[n] == cell for n in neighbors):
+                return False                            # some shortest route ran through the cell
+            dist[cell] = next_hop[cell] = UNREACHED
+            return True
+
+        reached = [n for n in neighbors if dist[n] != UNREACHED]
+        if not reached:
+            return True                                 # still cut off from this target
+        if any(dist[n] == UNREACHED and self.grid.is_open(n) for n in neighbors):
+            return False                                # the new tile joins a cut-off area
+        closest = min(reached, key=dist.__getitem__)
+        if max(dist[n] for n in reached) - dist[closest] > 2:
+            return False                                # the new tile is a shortcut
+        dist[cell] = dist[closest] + 1
+        next_hop[cell] = closest
+        return True
@@ -0,0 +1,148 @@
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+from grid import BLOCKED, Grid, Position
+from stats import ExpandHook, SearchResult, SearchStats
+
+INF = float("inf")
+
+Key = Tuple[float, float]
+
+class IncrementalPlanner:
+    """D* Lite towards one fixed goal, kept alive across queries and grid edits.
+
+    The search runs backwards from the goal, so g[cell] is the cost from cell to
+    the goal. Grid edits only re-queue the edited cell and its neighbors; the next
+    query repairs the cells whose cost actually changed and reuses the rest. Starts
+    may differ from query to query (the key modifier km keeps old queue keys valid).
+    """
+
+    def __init__(self, grid: Grid, goal: Position):
+        self.grid = grid
+        self.goal = grid.cell_id(*goal)
+        self.g: Dict[int, float] = {}                   # missing cells are INF
+        self.rhs: Dict[int, float] = {self.goal: 0}     # one-step lookahead of g
+        self.km = 0
+        self.last_start: Optional[int] = None
+        self._open: Dict[int, Key] = {}                 # cell -> key of its live heap entry
+        self._heap: List[Tuple[float, float, int]] = []
+        self._pushes = 0                                # running totals; route() reports the per-query delta
+        self._stale_pops = 0
+        self._push(self.goal, self._key(self.goal, self.goal))
+        grid.subscribe(self._on_cell_changed)
+
+    def close(self):
+        # stops tracking grid edits; the planner goes stale after this
+        self.grid.unsubscribe(self._on_cell_changed)
+
+    def route(self, start: Position, on_expand: Optional[ExpandHook] = None) -> SearchResult:
+        stats = SearchStats()
+        start_time = time.perf_counter()
+        grid = self.grid
+        start_cell = grid.cell_id(*start)
+
+        if self.last_start is not None and self.last_start != start_cell:
+            self.km += self._h(self.last_start, start_cell)
+        self.last_start = start_cell
+
+        pushes, stale_pops = self._pushes, self._stale_pops
+        self._compute(start_cell, stats, on_expand)
+        stats.heap_pushes = self._pushes - pushes
+        stats.stale_pops = self._stale_pops - stale_pops
+
+        path = cost = None
+        if grid.is_open(start_cell) and self.g.get(start_cell, INF) < INF:
+            path, cost = self._extract(start_cell), int(self.g[start_cell])
+        stats.peak_closed = len(self.g)
+        stats.peak_memory = stats.peak_frontier + stats.peak_closed
+        stats.wall_ms = (time.perf_counter() - start_time) * 1000
+        return SearchResult(path, cost, stats)
+
+    def _h(self, a: int, b: int) -> int:
+        cols = self.grid.cols
+        return (abs(a // cols - b // cols) + abs(a % cols - b % cols)) * self.grid.min_cost
+
+    def _key(self, cell: int, start: int) -> Key:
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return best + self._h(start, cell) + self.km, best
+
+    def _push(self, cell: int, key: Key):
+        self._open[cell] = key
+        self._pushes += 1
+        heapq.heappush(self._heap, (key[0], key[1], cell))
+
+    def _top_key(self) -> Key:
+        heap = self._heap
+        while heap:
+            k1, k2, cell = heap[0]
+            if self._open.get(cell) == (k1, k2):
+                return k1, k2
+            heapq.heappop(heap)
+            self._stale_pops += 1                       # entry replaced or removed since it was pushed
+        return INF, INF
+
+    def _update(self, cell: int, start: int):
+        # recomputes rhs from the successors and queues the cell if it is inconsistent
+        if cell != self.goal:
+            grid = self.grid
+            if grid.is_open(cell):
+                g, cells, costs = self.g, grid.cells, grid.costs
+                self.rhs[cell] = min((g.get(n, INF) + costs[cells[n]] for n in grid.neighbors(cell)), default=INF)
+            else:
+                self.rhs[cell] = INF
+        self._open.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell, self._key(cell, start))
+
+    def _compute(self, start: int, stats: SearchStats, on_expand: Optional[ExpandHook]):
+        g, rhs, grid = self.g, self.rhs, self.grid
+        while True:
+            stats.peak_frontier = max(stats.peak_frontier, len(self._open))
+            top = self._top_key()
+            if top >= self._key(start, start) and g.get(start, INF) == rhs.get(start, INF):
+                return
+            _, _, cell = heapq.heappop(self._heap)
+            del self._open[cell]
+
+            new_key = self._key(cell, start)
+            if top < new_key:                           # key went stale after a km bump; requeue
+                self._push(cell, new_key)
+                continue
+
+            stats.nodes_expanded += 1
+            if on_expand is not None:
+                on_expand(grid.position(cell), g.get(cell, INF))
+            if g.get(cell, INF) > rhs.get(cell, INF):
+                g[cell] = rhs[cell]                     # overconsistent: settle the cell
+            else:
+                g.pop(cell, None)                       # underconsistent: reset and recompute it too
+                self._update(cell, start)
+            for neighbor in grid.neighbors(cell):
+                self._update(neighbor, start)
+                stats.nodes_generated += 1
+
+    def _extract(self, cell: int) -> List[Position]:
+        # greedy descent over step cost + g; every step strictly lowers the cost to go
+        grid, g = self.grid, self.g
+        cells, costs = grid.cells, grid.costs
+        path = [grid.position(cell)]
+        while cell != self.goal:
+            cell = min(grid.neighbors(cell), key=lambda n: g.get(n, INF) + costs[cells[n]])
+            path.append(grid.position(cell))
+        return path
+
+    def _on_cell_changed(self, cell: int, old: int, new: int):
+        costs = self.grid.costs
+        if (old == BLOCKED) == (new == BLOCKED) and costs[old] == costs[new]:     # e.g. walkable <-> eatery
+            return
+        start = self.last_start if self.last_start is not None else self.goal
+        cols, size = self.grid.cols, self.grid.size
+        self._update(cell, start)
+        for neighbor in (cell - cols, cell + cols):
+            if 0 <= neighbor < size:
+                self._update(neighbor, start)
+        if cell % cols > 0:
+            self._update(cell - 1, start)
+        if cell % cols < cols - 1:
+            self._update(cell + 1, start)
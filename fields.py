@@ -0,0 +1,109 @@
+import heapq
+from array import array
+from typing import Iterable, Optional, Sequence, Tuple
+
+from grid import BLOCKED, EATERY, Grid
+
+try:
+    import numpy as np
+except ImportError:                                 # optional: the pure Python fallback gives the same answers, slower
+    np = None
+
+UNREACHED = -1
+
+def eatery_cells(grid: Grid) -> list:
+    return [cell for cell in range(grid.size) if grid.cells[cell] == EATERY]
+
+def distance_field(grid: Grid, sources: Optional[Iterable[int]] = None,
+                   use_numpy: Optional[bool] = None) -> Tuple[Sequence[int], Sequence[int]]:
+    """Walking cost from every cell to its nearest source, plus which source that is.
+
+    Returns two flat sequences indexed by cell id: the distance and the label (the
+    nearest source's cell id, ties going to the smallest id), i.e. a Voronoi
+    partition of the map. Blocked and cut-off cells hold UNREACHED in both.
+    Sources default to every EATERY cell. With NumPy the whole frontier is relaxed
+    at once with array operations (BFS levels on unit-cost grids, label-correcting
+    rounds otherwise) and the results are int64 ndarrays; reshape them to
+    (rows, cols) for a 2-D view. Without NumPy, or with use_numpy=False, a
+    multi-source Dijkstra fills array('q') buffers instead.
+    """
+    sources = sorted(set(eatery_cells(grid) if sources is None else sources))
+    sources = [cell for cell in sources if grid.is_open(cell)]
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise ImportError("use_numpy=True needs NumPy installed.")
+        return _numpy_field(grid, sources)
+    return _python_field(grid, sources)
+
+def _numpy_field(grid: Grid, sources: Sequence[int]):
+    size, cols = grid.size, grid.cols
+    cells = np.frombuffer(grid.cells, dtype=np.uint8)
+    passable = cells != BLOCKED
+    step = np.asarray(grid.costs, dtype=np.int64)[cells]     # cost of stepping onto each cell
+    infinity = np.iinfo(np.int64).max // 4
+
+    dist = np.full(size, infinity, dtype=np.int64)
+    label = np.full(size, UNREACHED, dtype=np.int64)
+    frontier = np.asarray(sources, dtype=np.int64)
+    dist[frontier] = 0
+    label[frontier] = frontier
+    uniform = grid.is_uniform()
+
+    while frontier.size:
+        # every frontier cell offers itself to its open neighbors, all at once
+        col = frontier % cols
+        giving, receiving = [], []
+        for offset, inside in ((-cols, frontier >= cols), (cols, frontier < size - cols),
+                               (-1, col > 0), (1, col < cols - 1)):
+            giving.append(frontier[inside])
+            receiving.append(frontier[inside] + offset)
+        giving = np.concatenate(giving)
+        receiving = np.concatenate(receiving)
+        offered = dist[giving] + step[giving]       # walking towards the source enters the giving cell
+        offered_label = label[giving]
+
+        if uniform:                                 # BFS levels: only unreached cells can improve
+            keep = passable[receiving] & (dist[receiving] == infinity)
+        else:                                       # label-correcting: any strictly better (cost, label) offer
+            current = dist[receiving]
+            keep = passable[receiving] & ((offered < current) |
+                                          ((offered == current) & (offered_label < label[receiving])))
+        receiving, offered, offered_label = receiving[keep], offered[keep], offered_label[keep]
+
+        # several frontier cells may offer to the same cell: keep its lowest (cost, label) offer
+        order = np.lexsort((offered_label, offered, receiving))
+        receiving, offered, offered_label = receiving[order], offered[order], offered_label[order]
+        first = np.ones(receiving.size, dtype=bool)
+        first[1:] = receiving[1:] != receiving[:-1]
+        frontier = receiving[first]
+        dist[frontier] = offered[first]
+        label[frontier] = offered_label[first]
+
+    dist[dist == infinity] = UNREACHED
+    return dist, label
+
+def _python_field(grid: Grid, sources: Sequence[int]):
+    cells, costs = grid.cells, grid.costs
+    dist = array('q', [UNREACHED]) * grid.size
+    label = array('q', [UNREACHED]) * grid.size
+    queue = []
+    for source in sources:
+        dist[source] = 0
+        label[source] = source
+        queue.append((0, source, source))
+    heapq.heapify(queue)
+
+    # ordering on (distance, label) makes ties go to the smallest source id, as in the NumPy path
+    while queue:
+        d, source, cell = heapq.heappop(queue)
+        if d != dist[cell] or source != label[cell]:
+            continue
+        offered = d + costs[cells[cell]]            # a neighbor walking towards the source steps onto this cell
+        for neighbor in grid.neighbors(cell):
+            if dist[neighbor] == UNREACHED or (offered, source) < (dist[neighbor], label[neighbor]):
+                dist[neighbor] = offered
+                label[neighbor] = source
+                heapq.heappush(queue, (offered, source, neighbor))
+    return dist, label
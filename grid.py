@@ -0,0 +1,141 @@
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Constants
+WALKABLE = 0
+BLOCKED = 1
+EATERY = 2
+STAIRS = 3
+CROWDED = 4                                         # busy food court floor
+COVERED = 5                                         # covered walkway
+
+# cost of stepping onto a cell, by cell value; values not listed cost 1 (BLOCKED is never entered)
+STEP_COSTS = {WALKABLE: 1, EATERY: 1, STAIRS: 3, CROWDED: 2, COVERED: 1}
+
+Position = Tuple[int, int]
+CellListener = Callable[[int, int, int], None]    # (cell, old value, new value)
+
+class Grid:
+    """Compact grid map: one byte per cell, addressed by flat cell id (row * cols + col)."""
+
+    def __init__(self, rows: int, cols: int, cells: Optional[bytearray] = None,
+                 step_costs: Optional[Dict[int, int]] = None):
+        if rows <= 0 or cols <= 0:
+            raise ValueError("Grid dimensions must be positive.")
+        if cells is None:
+            cells = bytearray(rows * cols)
+        if len(cells) != rows * cols:
+            raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}.")
+
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.cells = cells
+        self._view = memoryview(cells).toreadonly()
+        self._listeners: List[CellListener] = []
+        self.version = 0                            # bumped by every effective set(); keys caches of derived results
+
+        # step costs are positive integers looked up per cell value; min_cost keeps heuristics admissible
+        self.step_costs = dict(STEP_COSTS if step_costs is None else step_costs)
+        if any(cost <= 0 for value, cost in self.step_costs.items() if value != BLOCKED):
+            raise ValueError("Step costs must be positive.")
+        self.costs = [self.step_costs.get(value, 1) for value in range(256)]
+        self.costs[BLOCKED] = 0
+        self.min_cost = min(cost for value, cost in enumerate(self.costs) if value != BLOCKED)
+        data = cells if isinstance(cells, (bytes, bytearray)) else bytes(cells)
+        self._weighted = sum(data.count(value) for value in range(256)     # open cells that do not cost 1
+                             if value != BLOCKED and self.costs[value] != 1)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]], step_costs: Optional[Dict[int, int]] = None) -> "Grid":
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("All grid rows must have the same length.")
+        return cls(len(rows), width, bytearray(value for row in rows for value in row), step_costs)
+
+    def release(self):
+        # drops the views into the cell buffer so a memory-mapped backing file can be closed
+        self._view.release()
+        if isinstance(self.cells, memoryview):
+            self.cells.release()
+
+    def cell_id(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def position(self, cell: int) -> Position:
+        return divmod(cell, self.cols)
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def get(self, row: int, col: int) -> int:
+        return self.cells[row * self.cols + col]
+
+    def set(self, row: int, col: int, value: int):
+        cell = row * self.cols + col
+        old = self.cells[cell]
+        if old == value:
+            return
+        self.cells[cell] = value
+        self.version += 1
+        costs = self.costs
+        self._weighted += (value != BLOCKED and costs[value] != 1) - (old != BLOCKED and costs[old] != 1)
+        for listener in self._listeners:
+            listener(cell, old, value)
+
+    def subscribe(self, listener: CellListener):
+        # listener is called after every cell edit made through set()
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: CellListener):
+        self._listeners.remove(listener)
+
+    def is_open(self, cell: int) -> bool:
+        return self.cells[cell] != BLOCKED
+
+    def cost(self, cell: int) -> int:
+        # cost of stepping onto cell
+        return self.costs[self.cells[cell]]
+
+    def is_uniform(self) -> bool:
+        # True when every open cell costs 1, so step counts are path costs
+        return self._weighted == 0
+
+    def neighbors(self, cell: int) -> List[int]:
+        # open neighbors in up, down, left, right order, found by stepping the flat index
+        cells = self.cells
+        cols = self.cols
+        result = []
+        up = cell - cols
+        if up >= 0 and cells[up] != BLOCKED:
+            result.append(up)
+        down = cell + cols
+        if down < self.size and cells[down] != BLOCKED:
+            result.append(down)
+        col = cell % cols
+        if col > 0 and cells[cell - 1] != BLOCKED:
+            result.append(cell - 1)
+        if col < cols - 1 and cells[cell + 1] != BLOCKED:
+            result.append(cell + 1)
+        return result
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> memoryview:
+        # read-only row view so grid[row][col] keeps working; writes go through set()
+        if not 0 <= row < self.rows:
+            raise IndexError("grid row out of range")
+        start = row * self.cols
+        return self._view[start:start + self.cols]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for row in range(self.rows):
+            yield self[row]
+
+def trace_parents(grid: Grid, parent: Dict[int, Optional[int]], cell: int) -> List[Position]:
+    # follows a cell id -> parent id map back to the root and returns the (row, col) path root first
+    path = []
+    while cell is not None:
+        path.append(grid.position(cell))
+        cell = parent[cell]
+    return path[::-1]
@@ -0,0 +1,265 @@
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from grid import BLOCKED, Grid, Position, trace_parents
+from stats import SearchResult, SearchStats
+
+MAX_SINGLE_ENTRANCE = 6                             # longer border openings get an entrance at each end
+
+class ClusterMap:
+    """HPA* abstraction: square clusters, border entrances and cached intra-cluster distances.
+
+    Queries search the small abstract graph and refine each abstract hop into grid
+    cells only when the path is walked. Routes are near-optimal, not guaranteed
+    optimal. A grid edit rebuilds only the cluster holding the cell, plus the
+    neighboring cluster when the cell lies on their shared border.
+    """
+
+    def __init__(self, grid: Grid, cluster_size: int = 10):
+        self.grid = grid
+        self.size = cluster_size
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.links: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}   # (cluster, right/lower cluster) -> entrance pairs
+        self.inter: Dict[int, Set[int]] = {}                            # entrance cell -> partner cells across a border
+        self.intra: Dict[int, Dict[int, Dict[int, int]]] = {}           # cluster -> entrance -> {entrance: distance}
+        self.rebuilds = 0
+
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            for other in self._forward_neighbors(cluster):
+                self._build_border(cluster, other)
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_intra(cluster)
+        grid.subscribe(self._on_cell_changed)
+
+    def close(self):
+        # stops tracking grid edits; the map goes stale after this
+        self.grid.unsubscribe(self._on_cell_changed)
+
+    def cluster_of(self, cell: int) -> int:
+        row, col = divmod(cell, self.grid.cols)
+        return (row // self.size) * self.cluster_cols + col // self.size
+
+    def bounds(self, cluster: int) -> Tuple[int, int, int, int]:
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        top, left = cluster_row * self.size, cluster_col * self.size
+        return top, min(top + self.size, self.grid.rows), left, min(left + self.size, self.grid.cols)
+
+    def entrances(self, cluster: int) -> Set[int]:
+        found = set()
+        for key in self._border_keys(cluster):
+            for a, b in self.links.get(key, ()):
+                found.add(a if self.cluster_of(a) == cluster else b)
+        return found
+
+    def route(self, start: Position, goal: Position) -> SearchResult:
+        # expansion and memory counts in the stats are abstract nodes; wall time includes refinement
+        start_time = time.perf_counter()
+        abstract, cost, stats = self.abstract_route(start, goal)
+        path = list(self.refine(abstract)) if abstract is not None else None
+        stats.wall_ms = (time.perf_counter() - start_time) * 1000
+        return SearchResult(path, cost, stats)
+
+    def abstract_route(self, start: Position, goal: Position) -> Tuple[Optional[List[int]], Optional[int], SearchStats]:
+        # (abstract cell ids or None, cost, stats of the abstract search)
+        stats = SearchStats()
+        grid = self.grid
+        if not grid.is_uniform():
+            raise ValueError("The cluster graph is built from step counts; use A* on weighted grids.")
+        cols = grid.cols
+        start_cell = grid.cell_id(*start)
+        goal_cell = grid.cell_id(*goal)
+        if not (grid.is_open(start_cell) and grid.is_open(goal_cell)):
+            return None, None, stats
+        if start_cell == goal_cell:
+            return [start_cell], 0, stats
+
+        # temporary edges linking start and goal into the abstract graph
+        start_cluster = self.cluster_of(start_cell)
+        goal_cluster = self.cluster_of(goal_cell)
+        from_start = self._distances_in_cluster(start_cell, start_cluster)
+        to_goal = self._distances_in_cluster(goal_cell, goal_cluster)
+        start_edges = {cell: d for cell, d in from_start.items() if cell in self.inter}
+        if start_cluster == goal_cluster and goal_cell in from_start:
+            start_edges[goal_cell] = from_start[goal_cell]
+        goal_edges = {cell: d for cell, d in to_goal.items() if cell in self.inter}
+
+        goal_row, goal_col = goal
+        counter = itertools.count()
+        g_cost = {start_cell: 0}
+        parent: Dict[int, Optional[int]] = {start_cell: None}
+        closed = set()
+        open_list = [(0, next(counter), start_cell)]
+        stats.heap_pushes = 1
+
+        while open_list:
+            stats.peak_frontier = max(stats.peak_frontier, len(open_list))
+            stats.peak_memory = max(stats.peak_memory, len(open_list) + len(closed))
+            _, _, node = heapq.heappop(open_list)
+            if node in closed:
+                stats.stale_pops += 1
+                continue
+            closed.add(node)
+            stats.nodes_expanded += 1
+            stats.peak_closed = len(closed)
+            if node == goal_cell:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1], g_cost[goal_cell], stats
+
+            if node == start_cell:
+                edges = itertools.chain(start_edges.items(), ((partner, 1) for partner in self.inter.get(node, ())))
+            else:
+                edges = itertools.chain(self.intra[self.cluster_of(node)].get(node, {}).items(),
+                                        ((partner, 1) for partner in self.inter.get(node, ())))
+                if node in goal_edges:
+                    edges = itertools.chain(edges, ((goal_cell, goal_edges[node]),))
+
+            for neighbor, step in edges:
+                if neighbor in closed:
+                    continue
+                stats.nodes_generated += 1
+                tentative_g = g_cost[node] + step
+                if tentative_g < g_cost.get(neighbor, tentative_g + 1):
+                    g_cost[neighbor] = tentative_g
+                    parent[neighbor] = node
+                    row, col = divmod(neighbor, cols)
+                    heapq.heappush(open_list, (tentative_g + abs(row - goal_row) + abs(col - goal_col),
+                                               next(counter), neighbor))
+                    stats.heap_pushes += 1
+
+        return None, None, stats
+
+    def refine(self, abstract: List[int]) -> Iterator[Position]:
+        # turns abstract hops into grid cells one hop at a time, as the caller consumes them
+        grid = self.grid
+        yield grid.position(abstract[0])
+        for a, b in zip(abstract, abstract[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                yield grid.position(b)                  # border crossing between adjacent entrances
+                continue
+            parent = self._search_in_cluster(a, cluster, b)
+            yield from trace_parents(grid, parent, b)[1:]
+
+    def _distances_in_cluster(self, source: int, cluster: int) -> Dict[int, int]:
+        distances = {}
+        self._search_in_cluster(source, cluster, None, distances)
+        return distances
+
+    def _search_in_cluster(self, source: int, cluster: int, target: Optional[int],
+                           distances: Optional[Dict[int, int]] = None) -> Dict[int, Optional[int]]:
+        # BFS that never leaves the cluster; stops early once target is reached
+        top, bottom, left, right = self.bounds(cluster)
+        cols = self.grid.cols
+        parent: Dict[int, Optional[int]] = {source: None}
+        if distances is not None:
+            distances[source] = 0
+        queue = deque([(source, 0)])
+        while queue:
+            cell, steps = queue.popleft()
+            if cell == target:
+                break
+            for neighbor in self.grid.neighbors(cell):
+                if neighbor in parent:
+                    continue
+                row, col = divmod(neighbor, cols)
+                if top <= row < bottom and left <= col < right:
+                    parent[neighbor] = cell
+                    if distances is not None:
+                        distances[neighbor] = steps + 1
+                    queue.append((neighbor, steps + 1))
+        return parent
+
+    def _forward_neighbors(self, cluster: int) -> List[int]:
+        # the cluster to the right and the cluster below, when they exist
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        result = []
+        if cluster_col + 1 < self.cluster_cols:
+            result.append(cluster + 1)
+        if cluster_row + 1 < self.cluster_rows:
+            result.append(cluster + self.cluster_cols)
+        return result
+
+    def _side_by_side(self, first: int, second: int) -> bool:
+        # True when second is to the right of first, False when it is below
+        return second == first + 1 and first % self.cluster_cols != self.cluster_cols - 1
+
+    def _border_keys(self, cluster: int) -> List[Tuple[int, int]]:
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        keys = [(cluster, other) for other in self._forward_neighbors(cluster)]
+        if cluster_col > 0:
+            keys.append((cluster - 1, cluster))
+        if cluster_row > 0:
+            keys.append((cluster - self.cluster_cols, cluster))
+        return keys
+
+    def _build_border(self, first: int, second: int):
+        for a, b in self.links.pop((first, second), ()):
+            for x, y in ((a, b), (b, a)):
+                partners = self.inter.get(x)
+                if partners is not None:
+                    partners.discard(y)
+                    if not partners:
+                        del self.inter[x]
+
+        grid = self.grid
+        cols = grid.cols
+        top, bottom, left, right = self.bounds(first)
+        if self._side_by_side(first, second):           # vertical border: walk down the shared column pair
+            pairs = [(row * cols + right - 1, row * cols + right) for row in range(top, bottom)]
+        else:                                           # horizontal border: walk along the shared row pair
+            pairs = [((bottom - 1) * cols + col, bottom * cols + col) for col in range(left, right)]
+
+        links = []
+        run: List[Tuple[int, int]] = []
+        for a, b in pairs + [(-1, -1)]:
+            if a >= 0 and grid.cells[a] != BLOCKED and grid.cells[b] != BLOCKED:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) < MAX_SINGLE_ENTRANCE:
+                    links.append(run[len(run) // 2])
+                else:
+                    links.extend((run[0], run[-1]))
+                run = []
+
+        self.links[(first, second)] = links
+        for a, b in links:
+            self.inter.setdefault(a, set()).add(b)
+            self.inter.setdefault(b, set()).add(a)
+
+    def _build_intra(self, cluster: int):
+        self.rebuilds += 1
+        entrances = self.entrances(cluster)
+        table = {}
+        for entrance in entrances:
+            distances = {}
+            self._search_in_cluster(entrance, cluster, None, distances)
+            table[entrance] = {other: distances[other] for other in entrances
+                               if other != entrance and other in distances}
+        self.intra[cluster] = table
+
+    def _on_cell_changed(self, cell: int, old: int, new: int):
+        if (old != BLOCKED) == (new != BLOCKED):       # an eatery appearing or disappearing changes no distances
+            return
+
+        cluster = self.cluster_of(cell)
+        row, col = divmod(cell, self.grid.cols)
+        top, bottom, left, right = self.bounds(cluster)
+        touched = {cluster}
+        for first, second in self._border_keys(cluster):
+            if self._side_by_side(first, second):
+                on_border = col == (right - 1 if cluster == first else left)
+            else:
+                on_border = row == (bottom - 1 if cluster == first else top)
+            if on_border:
+                self._build_border(first, second)
+                touched.add(second if cluster == first else first)
+        for each in touched:
+            self._build_intra(each)
@@ -0,0 +1,131 @@
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional
+
+from grid import BLOCKED, Grid, Position
+from stats import ExpandHook, SearchResult, SearchStats
+
+def jps_search(grid: Grid, start: Position, goal: Position, on_expand: Optional[ExpandHook] = None) -> SearchResult:
+    """Jump Point Search for a 4-connected, uniform-cost grid.
+
+    Straight runs are scanned without queueing the cells along them; only jump
+    points (the goal, cells with a forced neighbor, and cells from which a
+    horizontal run reaches one) enter the open list, so the expansion counts in the
+    returned stats are jump points. The path is filled in cell by cell. Pruning
+    relies on every step costing the same, so weighted grids raise ValueError.
+    """
+    if not grid.is_uniform():
+        raise ValueError("Jump Point Search needs uniform step costs; use A* on weighted grids.")
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    rows, cols = grid.rows, grid.cols
+    cells = grid.cells
+    goal_row, goal_col = goal
+
+    def walkable(row: int, col: int) -> bool:
+        return 0 <= row < rows and 0 <= col < cols and cells[row * cols + col] != BLOCKED
+
+    def jump_horizontal(row: int, col: int, d_col: int) -> Optional[Position]:
+        while walkable(row, col):
+            if row == goal_row and col == goal_col:
+                return row, col
+            if (walkable(row - 1, col) and not walkable(row - 1, col - d_col)) or \
+               (walkable(row + 1, col) and not walkable(row + 1, col - d_col)):
+                return row, col                     # forced neighbor above or below
+            col += d_col
+        return None
+
+    def jump_vertical(row: int, col: int, d_row: int) -> Optional[Position]:
+        while walkable(row, col):
+            if row == goal_row and col == goal_col:
+                return row, col
+            if (walkable(row, col - 1) and not walkable(row - d_row, col - 1)) or \
+               (walkable(row, col + 1) and not walkable(row - d_row, col + 1)):
+                return row, col                     # forced neighbor to the left or right
+            if jump_horizontal(row, col + 1, 1) or jump_horizontal(row, col - 1, -1):
+                return row, col                     # a sideways run from here reaches a jump point
+            row += d_row
+        return None
+
+    def successors(row: int, col: int, parent: Optional[Position]) -> List[Position]:
+        if parent is None:
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        else:
+            d_row = (row > parent[0]) - (row < parent[0])
+            d_col = (col > parent[1]) - (col < parent[1])
+            if d_col:
+                directions = [(-1, 0), (1, 0), (0, d_col)]
+            else:
+                directions = [(0, -1), (0, 1), (d_row, 0)]
+
+        found = []
+        for d_row, d_col in directions:
+            if d_col:
+                point = jump_horizontal(row, col + d_col, d_col)
+            else:
+                point = jump_vertical(row + d_row, col, d_row)
+            if point is not None:
+                found.append(point)
+        return found
+
+    counter = itertools.count()
+    h = abs(start[0] - goal_row) + abs(start[1] - goal_col)
+    open_list = [(h, h, next(counter), start)]
+    g_cost: Dict[Position, int] = {start: 0}
+    parent: Dict[Position, Optional[Position]] = {start: None}
+    closed = set()
+
+    stats.heap_pushes = 1
+    path = cost = None
+
+    while open_list:
+        stats.peak_memory = max(stats.peak_memory, len(open_list) + len(closed))
+        stats.peak_frontier = max(stats.peak_frontier, len(open_list))
+
+        _, _, _, current = heapq.heappop(open_list)
+        if current in closed:
+            stats.stale_pops += 1
+            continue
+        closed.add(current)
+        stats.nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(current, g_cost[current])
+
+        if current == goal:
+            path, cost = _expand(parent, current), g_cost[current]
+            break
+
+        row, col = current
+        for point in successors(row, col, parent[current]):
+            if point in closed:
+                continue
+            stats.nodes_generated += 1
+            tentative_g = g_cost[current] + abs(point[0] - row) + abs(point[1] - col)
+            if tentative_g < g_cost.get(point, tentative_g + 1):
+                g_cost[point] = tentative_g
+                parent[point] = current
+                h = abs(point[0] - goal_row) + abs(point[1] - goal_col)
+                heapq.heappush(open_list, (tentative_g + h, h, next(counter), point))
+                stats.heap_pushes += 1
+
+    stats.peak_closed = len(closed)
+    stats.wall_ms = (time.perf_counter() - start_time) * 1000
+    return SearchResult(path, cost, stats)
+
+def _expand(parent: Dict[Position, Optional[Position]], point: Position) -> List[Position]:
+    # fills in the straight runs between consecutive jump points
+    jump_points = []
+    while point is not None:
+        jump_points.append(point)
+        point = parent[point]
+    jump_points.reverse()
+
+    path = [jump_points[0]]
+    for (row, col), (next_row, next_col) in zip(jump_points, jump_points[1:]):
+        d_row = (next_row > row) - (next_row < row)
+        d_col = (next_col > col) - (next_col < col)
+        while (row, col) != (next_row, next_col):
+            row, col = row + d_row, col + d_col
+            path.append((row, col))
+    return path
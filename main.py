@@ -1,15 +1,24 @@
-from astar import run_astar
-from blindsearch import BlindSearch
+import argparse
+import contextlib
+import cProfile
+import csv
+import json
+import pstats
+import sys
 
 def main_menu():
     print("\nDLSU EATERY PATHFINDER")
     print("-" * 30)
     print("1 - Use Uniform Cost Search (UCS)")
     print("2 - Use A* Search")
-    print("3 - Exit")
+    print("3 - Profile a search")
+    print("4 - Exit")
     return input("Choose an option: ").strip()
 
-if __name__ == "__main__":
+def run_menu():
+    from astar import run_astar
+    from blindsearch import BlindSearch
+
     while True:
         choice = main_menu()
 
@@ -18,7 +27,237 @@ if __name__ == "__main__":
         elif choice == "2":
             run_astar()
         elif choice == "3":
+            run_profile_menu()
+        elif choice == "4":
             print("Exiting program.")
             break
         else:
             print("Invalid choice. Try again.")
+
+def run_profile_menu():
+    # times one route's search phases, then prints the cProfile hot spots; optionally writes them for flamegraph tools
+    from astar import Pathfinder
+    from blindsearch import BlindSearch
+    from profiling import format_pstats, profile_search, write_profile
+
+    algo = input("Algorithm (1 - UCS, 2 - A*): ").strip()
+    if algo not in ("1", "2"):
+        print("Invalid choice. Try again.")
+        return
+    try:
+        start = (int(input("Start row: ")), int(input("Start column: ")))
+        goal = (int(input("Goal row: ")), int(input("Goal column: ")))
+        repeat = int(input("Repeat how many times? (default 100): ").strip() or 100)
+    except ValueError:
+        print("Error: Invalid number! Try again.")
+        return
+    prefix = input("Write profile files with this prefix (blank to skip): ").strip()
+
+    if algo == "1":
+        engine = BlindSearch(cache_size=0)          # no route cache, so every repeat is a real search
+        search, name = engine.uniform_cost_search, "uniform_cost_search"
+    else:
+        engine = Pathfinder(cache_size=0)
+        search, name = engine.astar_search, "astar_search"
+    for label, (row, col) in (("Start", start), ("Goal", goal)):
+        if not engine.grid.in_bounds(row, col) or not engine.grid.is_open(engine.grid.cell_id(row, col)):
+            print(f"Error: {label} must be an open cell inside the grid!")
+            return
+
+    phases, stats, tracer = profile_search(search, start, goal, repeat, stacks=bool(prefix))
+    print(f"\nPhase timers over {phases.searches} searches:")
+    print(phases.format())
+    print(format_pstats(stats, limit=12))
+    if prefix:
+        for path in write_profile(prefix, phases, stats, tracer, root=name):
+            print(f"Wrote {path}")
+
+def read_queries(stream, fmt):
+    # yields (start, goal) pairs one line at a time so the input is never buffered whole;
+    # a line that cannot be parsed yields a BadQuery, which comes back as an error result
+    from batch import BadQuery
+
+    if fmt == "csv":
+        reader = csv.reader(stream)
+        first = True
+        for row in reader:
+            if not row or not "".join(row).strip() or row[0].lstrip().startswith("#"):
+                continue                                    # blank or comment line
+            header, first = first and not row[0].strip().lstrip("-").isdigit(), False
+            if header:
+                continue                                    # column names
+            try:
+                if len(row) < 4:
+                    raise ValueError(f"expected start_row,start_col,goal_row,goal_col, got {len(row)} values")
+                sr, sc, gr, gc = (int(value) for value in row[:4])
+            except ValueError as error:
+                yield BadQuery(reader.line_num, str(error))
+                continue
+            yield (sr, sc), (gr, gc)
+        return
+
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            query = json.loads(line)
+            start, goal = (query["start"], query["goal"]) if isinstance(query, dict) else (query[0], query[1])
+            start, goal = _position(start), _position(goal)
+        except (ValueError, KeyError, IndexError, TypeError) as error:
+            yield BadQuery(number, f"{type(error).__name__}: {error}")
+            continue
+        yield start, goal
+
+def _position(value):
+    row, col = value
+    if not all(isinstance(part, int) and not isinstance(part, bool) for part in (row, col)):
+        raise ValueError(f"positions are [row, col] integers, got {value!r}")
+    return row, col
+
+CSV_FIELDS = ["index", "start_row", "start_col", "goal_row", "goal_col", "cost", "error", "path"]
+STATS_FIELDS = ["wall_ms", "nodes_expanded", "nodes_generated", "heap_pushes", "stale_pops",
+                "peak_frontier", "peak_closed", "peak_memory", "forward_expanded", "backward_expanded", "suboptimality",
+                "cache_hit"]
+
+def write_result(out, result, fmt, writer=None):
+    if fmt == "csv":
+        stats = [result.stats.get(name) for name in STATS_FIELDS]
+        writer.writerow([result.index, *(result.start or ("", "")), *(result.goal or ("", "")),
+                         "" if result.cost is None else result.cost, result.error or "",
+                         " ".join(f"{r},{c}" for r, c in result.path),
+                         *("" if value is None else value for value in stats)])
+    else:
+        out.write(json.dumps(result._asdict(), separators=(",", ":")))
+        out.write("\n")
+    out.flush()
+
+def run_route(args):
+    from batch import route_batch
+    from campusmap import DEFAULT_MAP, load_map
+    from profiling import PhaseProfile, StackTracer, write_profile
+
+    grid = load_map(args.map or DEFAULT_MAP).grid
+    if args.show_grid:
+        for row in grid:
+            print(" ".join(str(cell) for cell in row), file=sys.stderr)
+
+    source = sys.stdin if args.queries == "-" else open(args.queries, newline="")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    writer = None
+    if args.output_format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(CSV_FIELDS + STATS_FIELDS)
+
+    phases = profiler = tracer = None
+    if args.profile:                                # phase timers plus cProfile, or the stack tracer, around the whole batch
+        phases = PhaseProfile()
+        if args.profile_stacks:
+            tracer = StackTracer()
+        else:
+            profiler = cProfile.Profile()
+
+    try:
+        queries = read_queries(source, args.format)
+        results = route_batch(queries, args.algo, grid, workers=0 if args.profile else args.workers,
+                              chunk_size=args.chunk_size, profile=phases)
+        with tracer if tracer is not None else contextlib.nullcontext():
+            if profiler is not None:
+                profiler.enable()
+            for result in results:
+                write_result(out, result, args.output_format, writer)
+            if profiler is not None:
+                profiler.disable()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    if args.profile:
+        stats = pstats.Stats(profiler) if profiler is not None else None
+        for path in write_profile(args.profile, phases, stats, tracer, root=f"route {args.algo}"):
+            print(f"Wrote {path}", file=sys.stderr)
+
+def run_serve(args):
+    from campusmap import DEFAULT_MAP, load_map
+    from server import run_server
+
+    run_server(load_map(args.map or DEFAULT_MAP), args.host, args.port, args.workers)
+
+def run_convert_map(args):
+    from campusmap import load_map, save_map
+
+    campus_map = load_map(args.source)
+    save_map(campus_map, args.target, binary=args.binary or None)
+    campus_map.close()
+    print(f"Wrote {campus_map.grid.rows}x{campus_map.grid.cols} map with "
+          f"{len(campus_map.eateries)} eateries to {args.target}", file=sys.stderr)
+
+def run_snapshot(args):
+    from astar import Pathfinder
+    from campusmap import DEFAULT_MAP, load_map
+
+    campus_map = load_map(args.map or DEFAULT_MAP)
+    pathfinder = Pathfinder(campus_map)
+    pathfinder.save_snapshot(args.target, precompute=not args.no_indexes)
+    campus_map.close()
+    print(f"Wrote snapshot of the {campus_map.grid.rows}x{campus_map.grid.cols} map with "
+          f"{len(pathfinder.eateries)} eateries to {args.target}", file=sys.stderr)
+
+def build_parser():
+    from batch import ALGORITHMS                    # the one list of routable algorithms, shared with the server and benchmark
+
+    parser = argparse.ArgumentParser(description="DLSU eatery pathfinder")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("menu", help="interactive menu (default when no command is given)")
+
+    route = commands.add_parser("route", help="route a stream of start/goal queries without prompts")
+    route.add_argument("--algo", choices=ALGORITHMS, default="astar")
+    route.add_argument("--queries", default="-", help="query file, or - for stdin (default)")
+    route.add_argument("--format", choices=["jsonl", "csv"], default="jsonl",
+                       help='input format: {"start": [r, c], "goal": [r, c]} per line, or start_row,start_col,goal_row,goal_col')
+    route.add_argument("--output", default="-", help="result file, or - for stdout (default)")
+    route.add_argument("--output-format", choices=["jsonl", "csv"], default="jsonl")
+    route.add_argument("--workers", type=int, default=0, help="worker processes; 0 routes in this process (default)")
+    route.add_argument("--chunk-size", type=int, default=64)
+    route.add_argument("--show-grid", action="store_true", help="print the grid to stderr before routing")
+    route.add_argument("--map", default=None, help="text, binary or snapshot map file (default: maps/dlsu.txt)")
+    route.add_argument("--profile", default=None, metavar="PREFIX",
+                       help="profile in this process and write PREFIX.pstats and PREFIX.phases.collapsed "
+                            "(phase timers for astar and ucs)")
+    route.add_argument("--profile-stacks", action="store_true",
+                       help="with --profile, trace full call stacks into PREFIX.collapsed instead of cProfile")
+
+    serve = commands.add_parser("serve", help="serve route, nearest-eatery and map-edit requests over HTTP/JSON")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--map", default=None, help="text, binary or snapshot map file (default: maps/dlsu.txt)")
+    serve.add_argument("--workers", type=int, default=None, help="search threads (default: Python's thread pool default)")
+
+    convert = commands.add_parser("convert-map", help="convert a map file between the text and binary formats")
+    convert.add_argument("source", help="map file to read (format is detected)")
+    convert.add_argument("target", help="map file to write; a .bin extension writes the binary format")
+    convert.add_argument("--binary", action="store_true", help="write the binary format whatever the extension")
+
+    snapshot = commands.add_parser("snapshot", help="save the map with precomputed search indexes for fast startup")
+    snapshot.add_argument("target", help="snapshot file to write; --map options load it like any other map")
+    snapshot.add_argument("--map", default=None, help="map file to snapshot (default: maps/dlsu.txt)")
+    snapshot.add_argument("--no-indexes", action="store_true", help="save only the grid and eateries")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "route":
+        run_route(args)
+    elif args.command == "serve":
+        run_serve(args)
+    elif args.command == "convert-map":
+        run_convert_map(args)
+    elif args.command == "snapshot":
+        run_snapshot(args)
+    else:
+        run_menu()
+
+if __name__ == "__main__":
+    main()
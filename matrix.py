@@ -0,0 +1,130 @@
+import heapq
+from array import array
+from collections import deque
+from typing import Iterator, Sequence, Tuple
+
+from grid import Grid, Position
+
+try:
+    import numpy as np
+except ImportError:                                 # optional: only CostMatrix.to_numpy() needs it
+    np = None
+
+UNREACHED = -1
+
+class CostMatrix:
+    """Row-major walking costs, sources by targets, in one flat array('q')."""
+
+    __slots__ = ("rows", "cols", "values")
+
+    def __init__(self, rows: int, cols: int, values: array):
+        self.rows = rows
+        self.cols = cols
+        self.values = values                        # UNREACHED where a target cannot be reached
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.rows, self.cols
+
+    def __getitem__(self, index: Tuple[int, int]) -> int:
+        row, col = index
+        return self.values[row * self.cols + col]
+
+    def row(self, index: int) -> array:
+        return self.values[index * self.cols:(index + 1) * self.cols]
+
+    def __iter__(self) -> Iterator[array]:
+        return (self.row(index) for index in range(self.rows))
+
+    def to_numpy(self):
+        # zero-copy (rows, cols) int64 view of the values
+        if np is None:
+            raise ImportError("CostMatrix.to_numpy() needs NumPy installed.")
+        return np.frombuffer(self.values, dtype=np.int64).reshape(self.rows, self.cols)
+
+    def __repr__(self):
+        return f"CostMatrix({self.rows}x{self.cols})"
+
+class RouteMatrix:
+    """Many-to-many walking costs from one expansion per source.
+
+    The distance and settled buffers are allocated once per grid and stamped
+    with a generation number instead of being cleared, so a cell's entry only
+    counts when its stamp matches the current source's generation. Each
+    expansion (BFS on unit-cost grids, Dijkstra otherwise) stops as soon as
+    every target is settled. The buffers are shared, so one RouteMatrix should
+    not be used from several threads at once.
+    """
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.dist = array('q', [0]) * grid.size
+        self.seen = array('I', [0]) * grid.size     # generation that last wrote dist[cell]
+        self.done = array('I', [0]) * grid.size     # generation that last settled the cell
+        self.generation = 0
+        self.nodes_expanded = 0                     # across every expansion so far
+
+    def costs(self, sources: Sequence[Position], targets: Sequence[Position]) -> CostMatrix:
+        grid = self.grid
+        target_cells = [grid.cell_id(*target) for target in targets]
+        values = array('q', [UNREACHED]) * (len(sources) * len(target_cells))
+        expand = self._bfs if grid.is_uniform() else self._dijkstra
+        for row, source in enumerate(sources):
+            source_cell = grid.cell_id(*source)
+            if not grid.is_open(source_cell):
+                continue
+            self._next_generation()
+            expand(source_cell, set(target_cells))
+            dist, seen, generation = self.dist, self.seen, self.generation
+            base = row * len(target_cells)
+            for col, cell in enumerate(target_cells):
+                if seen[cell] == generation:
+                    values[base + col] = dist[cell]
+        return CostMatrix(len(sources), len(target_cells), values)
+
+    def _next_generation(self):
+        self.generation += 1
+        if self.generation == 1 << 32:              # stamps would wrap: reset them once and start over
+            self.seen = array('I', [0]) * self.grid.size
+            self.done = array('I', [0]) * self.grid.size
+            self.generation = 1
+
+    def _bfs(self, source: int, pending: set):
+        grid = self.grid
+        dist, seen, generation = self.dist, self.seen, self.generation
+        dist[source] = 0
+        seen[source] = generation
+        pending.discard(source)
+        queue = deque([source])
+        while queue and pending:
+            cell = queue.popleft()
+            self.nodes_expanded += 1
+            step = dist[cell] + 1
+            for neighbor in grid.neighbors(cell):
+                if seen[neighbor] != generation:
+                    seen[neighbor] = generation
+                    dist[neighbor] = step
+                    pending.discard(neighbor)
+                    queue.append(neighbor)
+        # in BFS order a cell's first distance is final, so anything seen is settled
+
+    def _dijkstra(self, source: int, pending: set):
+        grid = self.grid
+        cells, costs = grid.cells, grid.costs
+        dist, seen, done, generation = self.dist, self.seen, self.done, self.generation
+        dist[source] = 0
+        seen[source] = generation
+        queue = [(0, source)]
+        while queue and pending:
+            d, cell = heapq.heappop(queue)
+            if done[cell] == generation:
+                continue
+            done[cell] = generation
+            pending.discard(cell)
+            self.nodes_expanded += 1
+            for neighbor in grid.neighbors(cell):
+                step = d + costs[cells[neighbor]]
+                if seen[neighbor] != generation or step < dist[neighbor]:
+                    seen[neighbor] = generation
+                    dist[neighbor] = step
+                    heapq.heappush(queue, (step, neighbor))
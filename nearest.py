@@ -0,0 +1,178 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from grid import Grid, Position, trace_parents
+
+class GoalIndex:
+    """Bucketed spatial index answering 'Manhattan distance to the closest remaining goal'.
+
+    Goals sit in square buckets, and the bounding box of the occupied buckets is
+    kept up to date by add and remove, so a ring scan never walks past the last
+    bucket that can hold a goal. Each queried bucket caches its candidates, the
+    goals that can be nearest to some cell inside it; a lookup is then a min
+    over that short list. An add drops every cached list, a remove only the
+    lists holding that goal.
+    """
+
+    def __init__(self, goals: Iterable[Position] = (), bucket_size: int = 8):
+        self.bucket_size = bucket_size
+        self.buckets: Dict[Tuple[int, int], Set[Position]] = {}
+        self.bounds: Optional[Tuple[int, int, int, int]] = None    # (min row, max row, min col, max col) of occupied buckets
+        self.candidates: Dict[Tuple[int, int], List[Position]] = {}
+        size = bucket_size
+        for goal in goals:
+            self.buckets.setdefault((goal[0] // size, goal[1] // size), set()).add(tuple(goal))
+        self.count = sum(map(len, self.buckets.values()))
+        self._rebound()
+
+    def add(self, goal: Position):
+        key = (goal[0] // self.bucket_size, goal[1] // self.bucket_size)
+        bucket = self.buckets.setdefault(key, set())
+        if goal not in bucket:
+            bucket.add(goal)
+            self.count += 1
+            self.candidates.clear()
+            if self.bounds is None:
+                self.bounds = (key[0], key[0], key[1], key[1])
+            else:
+                top, bottom, left, right = self.bounds
+                self.bounds = (min(top, key[0]), max(bottom, key[0]), min(left, key[1]), max(right, key[1]))
+
+    def remove(self, goal: Position):
+        key = (goal[0] // self.bucket_size, goal[1] // self.bucket_size)
+        bucket = self.buckets.get(key)
+        if bucket and goal in bucket:
+            bucket.remove(goal)
+            self.count -= 1
+            # only lists holding the goal change: any other goal was farther than that list's reach
+            for cached, candidates in list(self.candidates.items()):
+                if goal in candidates:
+                    del self.candidates[cached]
+            if not bucket:
+                del self.buckets[key]
+                top, bottom, left, right = self.bounds
+                if key[0] in (top, bottom) or key[1] in (left, right):    # an edge bucket emptied: shrink the box
+                    self._rebound()
+
+    def _rebound(self):
+        if not self.buckets:
+            self.bounds = None
+            return
+        rows = [r for r, _ in self.buckets]
+        cols = [c for _, c in self.buckets]
+        self.bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def nearest_distance(self, row: int, col: int) -> Optional[int]:
+        if not self.count:
+            return None
+        size = self.bucket_size
+        key = (row // size, col // size)
+        candidates = self.candidates.get(key)
+        if candidates is None:
+            candidates = self.candidates[key] = self._collect(key)
+        return min(abs(row - goal_row) + abs(col - goal_col) for goal_row, goal_col in candidates)
+
+    def _collect(self, key: Tuple[int, int]) -> List[Position]:
+        # scans rings of buckets outward from key, within the occupied box, until no unscanned bucket can hold
+        # a goal nearer than reach (the least, over goals, of the distance from the bucket's farthest cell)
+        size = self.bucket_size
+        br, bc = key
+        top, bottom, left, right = self.bounds
+        row0, col0 = br * size, bc * size
+        row1, col1 = row0 + size - 1, col0 + size - 1
+        found = []
+        reach = None
+        first = max(0, top - br, br - bottom, left - bc, bc - right)
+        last = max(br - top, bottom - br, bc - left, right - bc)
+        for ring in range(first, last + 1):
+            if reach is not None and (ring - 1) * size + 1 > reach:
+                break                                   # every goal in this ring is farther than reach from the bucket
+            for ring_key in self._ring(br, bc, ring):
+                for goal_row, goal_col in self.buckets.get(ring_key, ()):
+                    near = max(0, row0 - goal_row, goal_row - row1) + max(0, col0 - goal_col, goal_col - col1)
+                    far = max(goal_row - row0, row1 - goal_row) + max(goal_col - col0, col1 - goal_col)
+                    found.append((near, (goal_row, goal_col)))
+                    if reach is None or far < reach:
+                        reach = far
+        return [goal for near, goal in found if near <= reach]
+
+    def _ring(self, br: int, bc: int, ring: int) -> List[Tuple[int, int]]:
+        # the bucket keys at Chebyshev distance ring from (br, bc), clipped to the occupied box
+        top, bottom, left, right = self.bounds
+        if ring == 0:
+            return [(br, bc)]
+        first_col, last_col = max(bc - ring, left), min(bc + ring, right)
+        first_row, last_row = max(br - ring + 1, top), min(br + ring - 1, bottom)
+        keys = []
+        for r in (br - ring, br + ring):
+            if top <= r <= bottom:
+                keys += [(r, c) for c in range(first_col, last_col + 1)]
+        for c in (bc - ring, bc + ring):
+            if left <= c <= right:
+                keys += [(r, c) for r in range(first_row, last_row + 1)]
+        return keys
+
+def multi_goal_search(grid: Grid, start: Position, goals: Iterable[Position], k: int = 1,
+                      use_heuristic: bool = True) -> Tuple[List[Tuple[Position, List[Position], int]], int]:
+    """Single expansion that settles the k closest goals by walking cost.
+
+    With use_heuristic the frontier is ordered by g + (Manhattan distance to the
+    nearest goal not yet found, times the cheapest step cost), ties going to the
+    lower heuristic, otherwise this is plain uniform cost search. Finding a goal
+    can only raise the heuristic, so the frontier is re-keyed once per goal found.
+    Returns ([(goal, path, cost), ...] closest first, nodes expanded).
+    """
+    goals = list(goals)
+    goal_cells = {grid.cell_id(*goal) for goal in goals}
+    index = GoalIndex(goals) if use_heuristic else None
+    cols = grid.cols
+    cells, costs, min_cost = grid.cells, grid.costs, grid.min_cost
+
+    def heuristic(cell: int) -> int:
+        if index is None:
+            return 0
+        distance = index.nearest_distance(cell // cols, cell % cols)
+        return 0 if distance is None else distance * min_cost
+
+    start_cell = grid.cell_id(*start)
+    parent: Dict[int, Optional[int]] = {start_cell: None}
+    g_cost = {start_cell: 0}
+    settled = set()
+    h = heuristic(start_cell)
+    frontier = [(h, h, 0, start_cell)]
+    found = []
+    nodes_expanded = 0
+
+    while frontier and len(found) < k and goal_cells:
+        _, _, g, cell = heapq.heappop(frontier)
+        if cell in settled or g > g_cost[cell]:
+            continue
+
+        settled.add(cell)
+        nodes_expanded += 1
+
+        if cell in goal_cells:
+            goal_cells.discard(cell)
+            found.append((grid.position(cell), trace_parents(grid, parent, cell), g))
+            if len(found) == k or not goal_cells:
+                break
+            if index is not None:
+                index.remove(grid.position(cell))
+                frontier = [(queued_g + h, h, queued_g, queued)
+                            for _, _, queued_g, queued in frontier
+                            if queued not in settled and queued_g == g_cost[queued]
+                            for h in (heuristic(queued),)]
+                heapq.heapify(frontier)
+
+        for neighbor in grid.neighbors(cell):
+            tentative_g = g + costs[cells[neighbor]]
+            if neighbor not in settled and tentative_g < g_cost.get(neighbor, tentative_g + 1):
+                g_cost[neighbor] = tentative_g
+                parent[neighbor] = cell
+                h = heuristic(neighbor)
+                heapq.heappush(frontier, (tentative_g + h, h, tentative_g, neighbor))
+
+    return found, nodes_expanded
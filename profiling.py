@@ -0,0 +1,147 @@
+import cProfile
+import io
+import pstats
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+# phases the instrumented search loops report
+HEAP = "heap"                                       # heap pops and pushes
+VISITED = "visited"                                 # closed-set checks and updates for the popped cell
+NEIGHBORS = "neighbors"                             # neighbor generation, filtering and relaxation
+TRACE = "trace"                                     # path reconstruction
+PHASES = (HEAP, VISITED, NEIGHBORS, TRACE)
+
+class PhaseProfile:
+    """Phase-level timers and counters filled in by searches given profile=...
+
+    A search calls start() once and then lap(phase) at every phase boundary; each
+    lap charges the time since the previous one to that phase. Searches bind
+    profile.lap to a local once per call and guard each lap with a plain truth
+    test, so with profiling off (profile=None) the loops pay one local check per
+    phase and never touch a clock. One profile can accumulate many searches.
+    """
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counts: Counter = Counter()
+        self.searches = 0
+        self._last = 0.0
+
+    def start(self):
+        self.searches += 1
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + now - self._last
+        self.counts[phase] += 1
+        self._last = now
+
+    def as_dict(self) -> Dict:
+        return {"searches": self.searches,
+                "phases": {phase: {"ms": self.seconds[phase] * 1000, "count": self.counts[phase]}
+                           for phase in self.seconds}}
+
+    def format(self) -> str:
+        total = sum(self.seconds.values()) or 1.0
+        lines = [f"{'phase':<10} {'ms':>10} {'share':>7} {'count':>10}"]
+        for phase, seconds in sorted(self.seconds.items(), key=lambda item: -item[1]):
+            lines.append(f"{phase:<10} {seconds * 1000:>10.3f} {seconds / total:>7.1%} {self.counts[phase]:>10}")
+        return "\n".join(lines)
+
+    def collapsed(self, root: str = "search") -> str:
+        # one "root;phase microseconds" line per phase, the input format of flamegraph.pl and speedscope
+        return "".join(f"{root};{phase} {round(seconds * 1e6)}\n"
+                       for phase, seconds in self.seconds.items() if seconds > 0)
+
+class StackTracer:
+    """Deterministic call-stack tracer for flamegraphs (a context manager).
+
+    While active, every Python and C call on this thread is followed through
+    sys.setprofile and each full stack is charged its own (self) time, so the
+    collapsed output adds up to the traced wall time. Tracing slows the code
+    several times over; compare shares rather than absolute times.
+    """
+
+    def __init__(self):
+        self.totals: Counter = Counter()            # stack tuple -> self time in nanoseconds
+        self._stack: List[str] = []
+        self._last = 0
+
+    def __enter__(self) -> "StackTracer":
+        self._stack = []
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self._trace)
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.setprofile(None)
+
+    def _trace(self, frame, event: str, arg):
+        now = time.perf_counter_ns()
+        if self._stack:
+            self.totals[tuple(self._stack)] += now - self._last
+        if event == "call":
+            code = frame.f_code
+            self._stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+        elif event == "c_call":
+            self._stack.append(getattr(arg, "__qualname__", None) or getattr(arg, "__name__", "<builtin>"))
+        elif self._stack:                           # return, c_return, c_exception
+            self._stack.pop()
+        self._last = time.perf_counter_ns()
+
+    def collapsed(self) -> str:
+        # "frame;frame;frame microseconds" per distinct stack
+        return "".join(f"{';'.join(stack)} {nanoseconds // 1000}\n"
+                       for stack, nanoseconds in sorted(self.totals.items()) if nanoseconds >= 1000)
+
+def profile_call(func: Callable, *args, **kwargs) -> Tuple[object, pstats.Stats]:
+    # runs func under cProfile; returns its result and the collected stats
+    profiler = cProfile.Profile()
+    result = profiler.runcall(func, *args, **kwargs)
+    return result, pstats.Stats(profiler)
+
+def format_pstats(stats: pstats.Stats, sort: str = "cumulative", limit: int = 15) -> str:
+    out = io.StringIO()
+    stats.stream = out
+    stats.sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+def profile_search(search: Callable, start, goal, repeat: int = 1,
+                   stacks: bool = False) -> Tuple[PhaseProfile, pstats.Stats, Optional[StackTracer]]:
+    """Runs search(start, goal) repeat times per profiler: phase timers, cProfile, then optionally stacks.
+
+    search must accept profile= (Pathfinder.astar_search, BlindSearch.uniform_cost_search).
+    cProfile and the stack tracer both hook sys.setprofile, so each gets its own runs;
+    give the engine cache_size=0 so those runs really search instead of hitting the route cache.
+    """
+    phases = PhaseProfile()
+    for _ in range(repeat):
+        search(start, goal, profile=phases)
+    _, stats = profile_call(lambda: [search(start, goal) for _ in range(repeat)])
+    tracer = None
+    if stacks:
+        with StackTracer() as tracer:
+            for _ in range(repeat):
+                search(start, goal)
+    return phases, stats, tracer
+
+def write_profile(prefix: str, phases: Optional[PhaseProfile] = None, stats: Optional[pstats.Stats] = None,
+                  tracer: Optional[StackTracer] = None, root: str = "search") -> List[str]:
+    # writes prefix.pstats (cProfile, for pstats/snakeviz), prefix.collapsed (stacks) and
+    # prefix.phases.collapsed (phase timers) for whichever parts are given; returns the paths written
+    written = []
+    if stats is not None:
+        stats.dump_stats(prefix + ".pstats")
+        written.append(prefix + ".pstats")
+    if tracer is not None:
+        with open(prefix + ".collapsed", "w") as handle:
+            handle.write(tracer.collapsed())
+        written.append(prefix + ".collapsed")
+    if phases is not None:
+        with open(prefix + ".phases.collapsed", "w") as handle:
+            handle.write(phases.collapsed(root))
+        written.append(prefix + ".phases.collapsed")
+    return written
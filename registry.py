@@ -0,0 +1,161 @@
+import heapq
+import string
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Set
+
+from grid import Position
+
+GRAM = 3                                            # names are indexed by every substring up to this length
+
+class Eatery:
+    def __init__(self, name: str, row: int, col: int):
+        self.name = name
+        self.row = row
+        self.col = col
+
+    def __repr__(self):
+        return f"{self.name}: {self.row}, {self.col}"
+
+def key_for(index: int) -> str:
+    # 0 -> A, 25 -> Z, 26 -> AA, ... 701 -> ZZ, 702 -> AAA (spreadsheet-style column letters)
+    letters = string.ascii_uppercase
+    key = ""
+    index += 1
+    while index:
+        index, digit = divmod(index - 1, 26)
+        key = letters[digit] + key
+    return key
+
+def key_index(key: str) -> int:
+    # inverse of key_for: A -> 0, Z -> 25, AA -> 26
+    index = 0
+    for letter in key:
+        index = index * 26 + string.ascii_uppercase.index(letter) + 1
+    return index - 1
+
+class EateryRegistry(Mapping):
+    """Letter key -> Eatery, with indexes for the lookups the menus make.
+
+    Keys are handed out lowest-free-first from a heap of released indexes, so
+    adding never scans the used keys. Names are indexed by their 1-, 2- and
+    3-letter substrings (case-insensitive): short queries are answered from the
+    index directly, longer ones intersect their trigrams and verify the few
+    candidates left. Positions map back to the eateries standing on them.
+    Iteration follows insertion order, like the dict this replaces.
+    """
+
+    def __init__(self, records=(), keys=None):
+        self._eateries: Dict[str, Eatery] = {}
+        self._index_of: Dict[str, int] = {}         # key -> key index, to release it on removal
+        self._free: List[int] = []                  # released key indexes, lowest first
+        self._next_index = 0                        # first index never handed out
+        self._order: Dict[str, int] = {}            # key -> insertion sequence, for first-match semantics
+        self._sequence = 0
+        self._grams: Dict[str, Set[str]] = {}       # lowercase substring -> keys whose name contains it
+        self._by_name: Dict[str, List[str]] = {}    # exact name -> keys
+        self._by_position: Dict[Position, List[str]] = {}
+        if keys is None:
+            for name, row, col in records:
+                self.add(name, row, col)
+        else:                                       # restoring a saved registry, gaps in its keys included
+            for key, (name, row, col) in zip(keys, records):
+                self.add(name, row, col, key)
+
+    def __getitem__(self, key: str) -> Eatery:
+        return self._eateries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._eateries)
+
+    def __len__(self) -> int:
+        return len(self._eateries)
+
+    def add(self, name: str, row: int, col: int, key: Optional[str] = None) -> str:
+        # key picks a specific free key instead of the lowest one
+        if key is None:
+            index = heapq.heappop(self._free) if self._free else self._next_index
+        else:
+            index = key_index(key)
+            if key in self._eateries:
+                raise KeyError(f"Key {key} is already taken.")
+            if index < self._next_index:
+                self._free.remove(index)
+                heapq.heapify(self._free)
+            else:
+                for skipped in range(self._next_index, index):
+                    heapq.heappush(self._free, skipped)
+                self._next_index = index
+        if index == self._next_index:
+            self._next_index += 1
+        key = key_for(index)
+        eatery = Eatery(name, row, col)
+
+        self._eateries[key] = eatery
+        self._index_of[key] = index
+        self._order[key] = self._sequence
+        self._sequence += 1
+        for gram in _grams(name.lower()):
+            self._grams.setdefault(gram, set()).add(key)
+        self._by_name.setdefault(name, []).append(key)
+        self._by_position.setdefault((row, col), []).append(key)
+        return key
+
+    def remove(self, key: str) -> Eatery:
+        eatery = self._eateries.pop(key)
+        heapq.heappush(self._free, self._index_of.pop(key))
+        del self._order[key]
+        for gram in _grams(eatery.name.lower()):
+            keys = self._grams[gram]
+            keys.discard(key)
+            if not keys:
+                del self._grams[gram]
+        _discard(self._by_name, eatery.name, key)
+        _discard(self._by_position, (eatery.row, eatery.col), key)
+        return eatery
+
+    def search(self, text: str, prefix: bool = False) -> List[str]:
+        # keys whose name contains text (or starts with it), case-insensitive, in insertion order
+        text = text.lower()
+        if not text:
+            return list(self._eateries)
+        if len(text) <= GRAM:
+            keys = self._grams.get(text, set())
+        else:
+            keys = None
+            for gram in _trigrams(text):
+                found = self._grams.get(gram)
+                if not found:
+                    return []
+                keys = set(found) if keys is None else keys & found
+            keys = {key for key in keys if text in self._eateries[key].name.lower()}
+        if prefix:
+            keys = [key for key in keys if self._eateries[key].name.lower().startswith(text)]
+        return sorted(keys, key=self._order.__getitem__)
+
+    def find(self, text: str) -> Optional[str]:
+        # first key (in insertion order) whose name contains text
+        keys = self.search(text)
+        return keys[0] if keys else None
+
+    def named(self, name: str) -> List[str]:
+        return list(self._by_name.get(name, ()))
+
+    def at(self, position: Position) -> List[str]:
+        # keys of the eateries standing on position, in insertion order
+        return list(self._by_position.get(position, ()))
+
+    def name_at(self, position: Position) -> Optional[str]:
+        keys = self._by_position.get(position)
+        return self._eateries[keys[0]].name if keys else None
+
+def _grams(name: str) -> Set[str]:
+    return {name[i:i + size] for size in range(1, GRAM + 1) for i in range(len(name) - size + 1)}
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+def _discard(index: Dict, value, key: str):
+    keys = index[value]
+    keys.remove(key)
+    if not keys:
+        del index[value]
@@ -0,0 +1,54 @@
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from grid import BLOCKED, COVERED, CROWDED, EATERY, STAIRS, WALKABLE, Grid, Position
+
+Viewport = Tuple[int, int, int, int]                # top row, left col, bottom row, right col (bottom/right exclusive)
+
+NUMBERS = {WALKABLE: "0", BLOCKED: "1", EATERY: "2"}     # Pathfinder's view: the raw cell values
+MARKERS = {WALKABLE: ".", BLOCKED: "X", EATERY: "E",    # BlindSearch's view
+           STAIRS: "^", CROWDED: "#", COVERED: "="}
+
+def route_viewport(grid: Grid, path: Sequence[Position], margin: int) -> Viewport:
+    # bounding box of the route grown by margin cells on every side, clipped to the grid
+    rows = [row for row, _ in path]
+    cols = [col for _, col in path]
+    return (max(0, min(rows) - margin), max(0, min(cols) - margin),
+            min(grid.rows, max(rows) + margin + 1), min(grid.cols, max(cols) + margin + 1))
+
+def render_grid(grid: Grid, path: Iterable[Position] = (), start: Optional[Position] = None,
+                goal: Optional[Position] = None, symbols: Dict[int, str] = NUMBERS, width: int = 1,
+                row_labels: bool = False, viewport: Optional[Viewport] = None) -> str:
+    """Renders the grid (or a viewport of it) with the route marked as S, G and *.
+
+    Each row is one slice of the cell bytes mapped through a lookup table; route
+    cells are grouped by row up front and patched in, so the cost is one pass over
+    the visible cells plus one over the route. Every cell is right-aligned to
+    width and followed by a space.
+    """
+    top, left, bottom, right = viewport if viewport is not None else (0, 0, grid.rows, grid.cols)
+    table = [symbols.get(value, str(value)).rjust(width) for value in range(256)]
+    marks: Dict[int, List[Tuple[int, str]]] = {}
+    for row, col in path:
+        marks.setdefault(row, []).append((col, "*"))
+    for position, mark in ((goal, "G"), (start, "S")):      # later marks win, so S shows when start == goal
+        if position is not None:
+            marks.setdefault(position[0], []).append((position[1], mark))
+
+    cells = grid.cells
+    cols = grid.cols
+    lines = []
+    for row in range(top, bottom):
+        offset = row * cols
+        tokens = [table[value] for value in cells[offset + left:offset + right]]
+        for col, mark in marks.get(row, ()):
+            if left <= col < right:
+                tokens[col - left] = mark.rjust(width)
+        label = f"Row {row:2d}: " if row_labels else ""
+        lines.append(label + " ".join(tokens) + " \n")
+    return "".join(lines)
+
+def write_grid(grid: Grid, path: Iterable[Position] = (), start: Optional[Position] = None,
+               goal: Optional[Position] = None, stream=None, **options):
+    # one write call for the whole picture; options are passed on to render_grid
+    (stream if stream is not None else sys.stdout).write(render_grid(grid, path, start, goal, **options))
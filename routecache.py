@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from stats import SearchResult, SearchStats
+
+class RouteCache:
+    """Bounded LRU map from (algo, start, goal, grid version) to SearchResult.
+
+    A grid edit bumps Grid.version, so older keys can never be hit again; the
+    first lookup under a new version drops them all at once instead of waiting
+    for LRU eviction. A hit returns a new SearchResult with fresh stats
+    (cache_hit set, search counters zero) so callers never report the first
+    search's timings again; its path is shared and should be treated as
+    read-only. maxsize=0 disables caching. Safe to use from several threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 0:
+            raise ValueError("Cache size cannot be negative.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, SearchResult]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[SearchResult]:
+        with self._lock:
+            self._sync(version)
+            result = self._entries.get((key, version))
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((key, version))
+            self.hits += 1
+        stats = SearchStats()
+        stats.cache_hit = True
+        return SearchResult(result.path, result.cost, stats)
+
+    def put(self, key: Hashable, version: int, result: SearchResult):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._sync(version)
+            if version != self._version:
+                return                              # computed before an edit that has since landed
+            self._entries[(key, version)] = result
+            self._entries.move_to_end((key, version))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync(self, version: int):
+        if self._version is None or version > self._version:
+            self._entries.clear()
+            self._version = version
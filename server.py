@@ -0,0 +1,324 @@
+import asyncio
+import contextlib
+import functools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from astar import Pathfinder
+from batch import ALGORITHMS, bind_router, solve
+from blindsearch import BlindSearch
+from campusmap import CampusMap, default_map
+from grid import BLOCKED, Position
+
+STATEFUL = {"alt", "dstar", "hpa"}                  # engines that build or update shared indexes while searching
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+MAX_BODY = 1 << 20
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class ReadWriteLock:
+    """Many concurrent readers or one writer; a waiting writer holds off new readers."""
+
+    def __init__(self):
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._waiting_writers = 0
+
+    @contextlib.asynccontextmanager
+    async def read(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def write(self):
+        async with self._condition:
+            self._waiting_writers += 1
+            try:
+                await self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+class RoutingServer:
+    """HTTP/JSON front end over one loaded map.
+
+    Searches run on a thread pool so the event loop keeps accepting requests;
+    the map is shared mutable state, so threads (not processes) are used. Every
+    search holds the read side of a ReadWriteLock and every map edit the write
+    side, so an edit waits for running searches and searches never see a
+    half-applied edit. Engines that update their own indexes while searching
+    (ALT, D* Lite, HPA*) also take a per-engine mutex. Identical queries that
+    arrive while one is running share its result.
+
+    Endpoints (JSON bodies):
+        GET    /health               map size and version, request and route cache counters
+        GET    /eateries             [{key, name, row, col}]
+        POST   /route                {start, goal | eatery, algo?} -> {cost, path, stats, error}
+                                     algo "ara" also takes budget_ms?, max_expansions?, max_frontier?
+        POST   /nearest              {start, k?} -> {eateries: [{key, name, row, col, cost, path}], nodes_expanded}
+        POST   /cells                {row, col, value} -> {row, col, old, value}
+        POST   /eateries             {name, row, col} -> {key, name, row, col}
+        DELETE /eateries/<key>       -> {key, name, row, col}
+    """
+
+    def __init__(self, campus_map: Optional[CampusMap] = None, workers: Optional[int] = None):
+        self.pathfinder = Pathfinder(campus_map if campus_map is not None else default_map())
+        self.blind_search = BlindSearch(self.pathfinder.campus_map)
+        self.grid = self.pathfinder.grid
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.routers = {algo: bind_router(algo, self.pathfinder, self.blind_search) for algo in ALGORITHMS}
+        self.engine_locks = {algo: threading.Lock() for algo in STATEFUL}
+        self.lock: Optional[ReadWriteLock] = None   # created on the serving loop
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.requests = 0
+        self.searches = 0
+        self.coalesced = 0
+        self.edits = 0
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080,
+                    ready: Optional[Callable[[Tuple[str, int]], None]] = None):
+        self.lock = ReadWriteLock()
+        server = await asyncio.start_server(self._handle, host, port)
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    # --- HTTP plumbing ---
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                keep_alive = await self._respond(request_line, reader, writer)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line: bytes, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter) -> bool:
+        keep_alive = False
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY:
+                keep_alive = False
+                raise HTTPError(413, f"Request bodies are limited to {MAX_BODY} bytes.")
+            body = await reader.readexactly(length) if length else b""
+            self.requests += 1
+            status, payload = 200, await self._dispatch(method, target.split("?", 1)[0], body)
+        except HTTPError as error:
+            status, payload = error.status, {"error": str(error)}
+        except (ValueError, KeyError, TypeError, IndexError) as error:
+            status, payload = 400, {"error": f"Bad request: {error}"}
+        except asyncio.IncompleteReadError:
+            raise
+        except Exception as error:                  # keep serving other clients
+            status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+
+        data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+        return keep_alive
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        request = json.loads(body) if body else {}
+        if path == "/health" and method == "GET":
+            return self.health()
+        if path == "/route" and method == "POST":
+            return await self.route(request)
+        if path == "/nearest" and method == "POST":
+            return await self.nearest(request)
+        if path == "/cells" and method == "POST":
+            return await self.set_cell(request)
+        if path == "/eateries" and method == "GET":
+            return await self._read(self._list_eateries)
+        if path == "/eateries" and method == "POST":
+            return await self.add_eatery(request)
+        if path.startswith("/eateries/") and method == "DELETE":
+            return await self.remove_eatery(path[len("/eateries/"):])
+        if path in ("/health", "/route", "/nearest", "/cells", "/eateries") or path.startswith("/eateries/"):
+            raise HTTPError(405, f"{method} is not supported on {path}.")
+        raise HTTPError(404, f"No endpoint at {path}.")
+
+    # --- locking and coalescing ---
+
+    async def _read(self, work: Callable):
+        async with self.lock.read():
+            return await asyncio.get_running_loop().run_in_executor(self.executor, work)
+
+    async def _write(self, work: Callable):
+        async with self.lock.write():
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, work)
+            self.edits += 1
+            return result
+
+    def _coalesce(self, key: Tuple, work: Callable) -> Awaitable:
+        # identical in-flight queries share one search; shield keeps a disconnecting client from cancelling it
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._read(work))
+            future.add_done_callback(lambda done: self._inflight.pop(key, None)
+                                     if self._inflight.get(key) is done else None)
+            self.searches += 1
+        else:
+            self.coalesced += 1
+        return asyncio.shield(future)
+
+    # --- endpoints ---
+
+    def health(self) -> Dict:
+        return {"status": "ok", "rows": self.grid.rows, "cols": self.grid.cols,
+                "eateries": len(self.pathfinder.eateries), "requests": self.requests,
+                "searches": self.searches, "coalesced": self.coalesced, "edits": self.edits,
+                "version": self.grid.version, "astar_cache": self.pathfinder.route_cache.info(),
+                "ucs_cache": self.blind_search.route_cache.info()}
+
+    async def route(self, request: Dict) -> Dict:
+        algo = request.get("algo", "astar")
+        if algo not in self.routers:
+            raise HTTPError(400, f"Unknown algorithm '{algo}'. Choose from: {', '.join(ALGORITHMS)}.")
+        start = _position(request["start"])
+        goal = _position(request["goal"]) if "goal" in request else None
+        eatery = None if goal is not None else str(request["eatery"])
+        limits = {}
+        if algo == "ara":                           # anytime search: caps this request's time, expansions and frontier
+            for name, option in (("budget_ms", "time_budget_ms"), ("max_expansions", "max_expansions"),
+                                 ("max_frontier", "max_frontier")):
+                if request.get(name) is not None:
+                    limits[option] = float(request[name]) if name == "budget_ms" else int(request[name])
+
+        def work():
+            target = goal if goal is not None else self._eatery_position(eatery)
+            router = functools.partial(self.routers[algo], **limits) if limits else self.routers[algo]
+            lock = self.engine_locks.get(algo)
+            with lock if lock is not None else contextlib.nullcontext():
+                result = solve(self.grid, router, 0, start, target)
+            return {"start": start, "goal": target, "cost": result.cost, "path": result.path,
+                    "stats": result.stats, "error": result.error}
+
+        return await self._coalesce(("route", algo, start, goal, eatery, tuple(sorted(limits.items())),
+                                     self.grid.version), work)
+
+    async def nearest(self, request: Dict) -> Dict:
+        start = _position(request["start"])
+        k = int(request.get("k", 1))
+
+        def work():
+            if not self.grid.in_bounds(*start) or self.grid.get(*start) == BLOCKED:
+                raise HTTPError(400, "start must be an open cell inside the grid")
+            ranked, nodes_expanded = self.pathfinder.nearest_eateries(start, k)
+            return {"eateries": [dict(_eatery_json(self.pathfinder, eatery), cost=cost, path=path)
+                                 for eatery, path, cost in ranked],
+                    "nodes_expanded": nodes_expanded}
+
+        return await self._coalesce(("nearest", start, k, self.grid.version), work)
+
+    async def set_cell(self, request: Dict) -> Dict:
+        row, col, value = int(request["row"]), int(request["col"]), int(request["value"])
+        if not self.grid.in_bounds(row, col):
+            raise HTTPError(400, f"({row}, {col}) is outside the grid")
+        if not 0 <= value <= 255:
+            raise HTTPError(400, "cell values are single bytes")
+
+        def work():
+            old = self.grid.get(row, col)
+            self.grid.set(row, col, value)
+            return {"row": row, "col": col, "old": old, "value": value}
+
+        return await self._write(work)
+
+    async def add_eatery(self, request: Dict) -> Dict:
+        name, row, col = str(request["name"]).strip(), int(request["row"]), int(request["col"])
+        if not name:
+            raise HTTPError(400, "eatery name is empty")
+        if not self.grid.in_bounds(row, col):
+            raise HTTPError(400, f"({row}, {col}) is outside the grid")
+
+        def work():
+            if self.grid.get(row, col) == BLOCKED:
+                raise HTTPError(400, "cannot place an eatery on a blocked cell")
+            key = self.pathfinder.add_eatery(name, row, col)
+            return _eatery_json(self.pathfinder, self.pathfinder.eateries[key], key)
+
+        return await self._write(work)
+
+    async def remove_eatery(self, key: str) -> Dict:
+        key = key.upper()
+
+        def work():
+            if key not in self.pathfinder.eateries:
+                raise HTTPError(404, f"No eatery with key {key}.")
+            return _eatery_json(self.pathfinder, self.pathfinder.delete_eatery(key), key)
+
+        return await self._write(work)
+
+    def _list_eateries(self):
+        return [_eatery_json(self.pathfinder, eatery, key) for key, eatery in self.pathfinder.eateries.items()]
+
+    def _eatery_position(self, text: str) -> Position:
+        eatery = self.pathfinder.input_eatery(text)
+        if eatery is None:
+            raise HTTPError(404, f"No eatery matches '{text}'.")
+        return eatery.row, eatery.col
+
+def _position(value) -> Position:
+    row, col = value
+    return int(row), int(col)
+
+def _eatery_json(pathfinder: Pathfinder, eatery, key: Optional[str] = None) -> Dict:
+    if key is None:
+        key = next((k for k in pathfinder.eateries.at((eatery.row, eatery.col))
+                    if pathfinder.eateries[k] is eatery), None)
+    return {"key": key, "name": eatery.name, "row": eatery.row, "col": eatery.col}
+
+def run_server(campus_map: Optional[CampusMap] = None, host: str = "127.0.0.1", port: int = 8080,
+               workers: Optional[int] = None):
+    server = RoutingServer(campus_map, workers)
+    try:
+        asyncio.run(server.serve(host, port, ready=lambda address: print(
+            f"Routing server listening on http://{address[0]}:{address[1]}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,48 @@
+from typing import Callable, Dict, List, Optional
+
+from grid import Position
+
+ExpandHook = Callable[[Position, int], None]        # called with (cell, g) for every expanded cell
+
+class SearchStats:
+    """Counters filled in by a single search run; nothing is kept on the engine itself."""
+
+    __slots__ = ("wall_ms", "nodes_expanded", "nodes_generated", "heap_pushes", "stale_pops",
+                 "peak_frontier", "peak_closed", "peak_memory", "forward_expanded", "backward_expanded",
+                 "suboptimality", "cache_hit")
+
+    def __init__(self):
+        self.wall_ms = 0.0
+        self.nodes_expanded = 0                     # cells taken off the frontier and expanded
+        self.nodes_generated = 0                    # successors produced while expanding
+        self.heap_pushes = 0
+        self.stale_pops = 0                         # frontier entries popped and discarded as outdated
+        self.peak_frontier = 0
+        self.peak_closed = 0
+        self.peak_memory = 0                        # frontier + closed, in nodes
+        self.forward_expanded: Optional[int] = None     # bidirectional searches only
+        self.backward_expanded: Optional[int] = None
+        self.suboptimality: Optional[float] = None     # anytime searches only: cost <= suboptimality * optimal cost
+        self.cache_hit = False                      # answered from a route cache: no search ran, so its counters stay zero
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value}" for name, value in self.as_dict().items() if value is not None)
+        return f"SearchStats({fields})"
+
+class SearchResult:
+    __slots__ = ("path", "cost", "stats")
+
+    def __init__(self, path: Optional[List[Position]], cost: Optional[int], stats: SearchStats):
+        self.path = path                            # None when there is no path
+        self.cost = cost
+        self.stats = stats
+
+    @property
+    def found(self) -> bool:
+        return self.path is not None
+
+    def __repr__(self):
+        return f"SearchResult(cost={self.cost}, steps={len(self.path) - 1 if self.path else None}, stats={self.stats})"
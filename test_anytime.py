@@ -0,0 +1,31 @@
+import random
+
+from anytime import anytime_search
+from astar import Pathfinder
+from campusmap import CampusMap
+from grid import Grid
+
+def random_grid(rng, size, density, values=(0,)):
+    rows = [[1 if rng.random() < density else rng.choice(values) for _ in range(size)] for _ in range(size)]
+    rows[0][0] = rows[size - 1][size - 1] = 0
+    return Grid.from_rows(rows)
+
+def test_epsilon_one_expands_like_astar():
+    grid = random_grid(random.Random(2), 300, 0.25)
+    astar = Pathfinder(CampusMap.from_grid(grid), cache_size=0).astar_search((0, 0), (299, 299))
+    result = anytime_search(grid, (0, 0), (299, 299), epsilon=1.0)
+    assert result.cost == astar.cost
+    assert result.stats.nodes_expanded <= astar.stats.nodes_expanded * 1.1
+
+def test_beam_caps_open_list_and_keeps_bound():
+    rng = random.Random(4)
+    for _ in range(30):
+        grid = random_grid(rng, 30, 0.3, (0, 0, 3, 4, 5))
+        optimal = Pathfinder(CampusMap.from_grid(grid), cache_size=0).astar_search((0, 0), (29, 29)).cost
+        result = anytime_search(grid, (0, 0), (29, 29), max_frontier=8)
+        assert result.stats.peak_frontier <= 8
+        if optimal is None:
+            assert result.path is None
+            continue
+        assert result.cost >= optimal
+        assert result.cost <= result.stats.suboptimality * optimal + 1e-9
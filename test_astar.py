@@ -0,0 +1,19 @@
+from astar import Pathfinder
+from grid import EATERY, WALKABLE
+
+def test_delete_eatery_keeps_a_shared_cell():
+    pathfinder = Pathfinder()
+    row, col = next((r, c) for r in range(pathfinder.grid.rows) for c in range(pathfinder.grid.cols)
+                    if pathfinder.grid.get(r, c) == WALKABLE)
+    first = pathfinder.add_eatery("Kiosk One", row, col)
+    second = pathfinder.add_eatery("Kiosk Two", row, col)
+    reference = pathfinder.astar_search((0, 0), (row, col)).cost
+
+    pathfinder.delete_eatery(first)
+    assert pathfinder.grid.get(row, col) == EATERY
+    assert pathfinder.eateries.at((row, col)) == [second]
+    assert pathfinder.eatery_route((0, 0), pathfinder.eateries[second])[1] == reference
+
+    pathfinder.delete_eatery(second)
+    assert pathfinder.grid.get(row, col) == WALKABLE
+    assert pathfinder.eateries.at((row, col)) == []
@@ -0,0 +1,37 @@
+import random
+
+from astar import Pathfinder
+from bidirectional import bidirectional_search
+from campusmap import CampusMap
+from grid import Grid
+
+def random_grid(rng, size, density, values=(0,)):
+    rows = [[1 if rng.random() < density else rng.choice(values) for _ in range(size)] for _ in range(size)]
+    rows[0][0] = rows[size - 1][size - 1] = 0
+    return Grid.from_rows(rows)
+
+def test_costs_match_astar():
+    rng = random.Random(11)
+    for _ in range(40):
+        grid = random_grid(rng, 25, 0.3, (0, 0, 3, 4, 5))
+        pathfinder = Pathfinder(CampusMap.from_grid(grid), cache_size=0)
+        expected = pathfinder.astar_search((0, 0), (24, 24)).cost
+        for use_heuristic in (True, False):
+            result = bidirectional_search(grid, (0, 0), (24, 24), use_heuristic)
+            assert result.cost == expected
+            if result.path is not None:
+                assert result.path[0] == (0, 0) and result.path[-1] == (24, 24)
+                assert result.cost == sum(grid.cost(grid.cell_id(*cell)) for cell in result.path[1:])
+
+def test_heuristic_saves_expansions():
+    # front-to-end bi-A* should expand far fewer cells than bidirectional UCS and stay close to plain A*
+    for density in (0.0, 0.1, 0.25):
+        grid = random_grid(random.Random(5), 200, density)
+        pathfinder = Pathfinder(CampusMap.from_grid(grid), cache_size=0)
+        astar = pathfinder.astar_search((0, 0), (199, 199))
+        informed = bidirectional_search(grid, (0, 0), (199, 199))
+        blind = bidirectional_search(grid, (0, 0), (199, 199), use_heuristic=False)
+        assert informed.cost == blind.cost == astar.cost
+        assert informed.stats.nodes_expanded * 5 < blind.stats.nodes_expanded
+        assert informed.stats.nodes_expanded <= 3 * astar.stats.nodes_expanded
+        assert informed.stats.forward_expanded and informed.stats.backward_expanded
@@ -0,0 +1,54 @@
+import random
+import time
+
+from grid import Grid
+from nearest import GoalIndex, multi_goal_search
+
+def best_time(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+def test_goal_index_matches_brute_force_across_edits():
+    rng = random.Random(7)
+    goals = {(rng.randrange(60), rng.randrange(60)) for _ in range(40)}
+    index = GoalIndex(goals, bucket_size=4)
+    for _ in range(300):
+        row, col = rng.randrange(60), rng.randrange(60)
+        expected = min((abs(row - r) + abs(col - c) for r, c in goals), default=None)
+        assert index.nearest_distance(row, col) == expected
+        if goals and rng.random() < 0.1:
+            goal = rng.choice(sorted(goals))
+            goals.discard(goal)
+            index.remove(goal)
+        elif rng.random() < 0.05:
+            goal = (rng.randrange(60), rng.randrange(60))
+            goals.add(goal)
+            index.add(goal)
+
+def test_heuristic_and_ucs_agree_on_costs():
+    rng = random.Random(3)
+    rows = [[rng.choice([0, 0, 0, 1, 3, 4, 5]) for _ in range(40)] for _ in range(40)]
+    grid = Grid.from_rows(rows)
+    cells = [(r, c) for r in range(40) for c in range(40) if rows[r][c] != 1]
+    for _ in range(30):
+        goals = rng.sample(cells, 8)
+        start = rng.choice(cells)
+        informed, _ = multi_goal_search(grid, start, goals, 4)
+        blind, _ = multi_goal_search(grid, start, goals, 4, use_heuristic=False)
+        assert [cost for _, _, cost in informed] == [cost for _, _, cost in blind]
+
+def test_heuristic_beats_ucs_on_wall_time():
+    # goals clustered far from the start: UCS floods the map, the heuristic walks towards them
+    grid = Grid(300, 300)
+    goals = [(290 + i % 10, 290 + i // 10) for i in range(20)]
+    informed, informed_expanded = multi_goal_search(grid, (0, 0), goals, 3)
+    blind, blind_expanded = multi_goal_search(grid, (0, 0), goals, 3, use_heuristic=False)
+    assert [cost for _, _, cost in informed] == [cost for _, _, cost in blind]
+    assert informed_expanded < blind_expanded
+    informed_time = best_time(lambda: multi_goal_search(grid, (0, 0), goals, 3))
+    blind_time = best_time(lambda: multi_goal_search(grid, (0, 0), goals, 3, use_heuristic=False))
+    assert informed_time < blind_time
@@ -0,0 +1,11 @@
+from astar import Pathfinder
+from blindsearch import BlindSearch
+
+def test_hits_report_fresh_stats():
+    for search in (Pathfinder().astar_search, BlindSearch().uniform_cost_search):
+        first = search((0, 0), (9, 19))
+        again = search((0, 0), (9, 19))
+        assert not first.stats.cache_hit and first.stats.nodes_expanded > 0
+        assert again.stats.cache_hit and again.cost == first.cost and again.path == first.path
+        assert again.stats.nodes_expanded == again.stats.heap_pushes == 0
+        assert again.stats is not first.stats
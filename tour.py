@@ -0,0 +1,161 @@
+import heapq
+import itertools
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from grid import Grid, Position, trace_parents
+from stats import SearchStats
+
+INF = float("inf")
+EXACT_LIMIT = 12                                    # Held-Karp up to this many stops, local search beyond
+
+class TourResult(NamedTuple):
+    order: List[Position]                           # stops in visiting order (start excluded)
+    path: Optional[List[Position]]                  # stitched cell path, start first; None if a stop is unreachable
+    cost: Optional[int]
+    exact: bool                                     # True when the order is proven optimal (Held-Karp)
+    stats: SearchStats                              # expansions of the pairwise cost searches
+
+def plan_tour(grid: Grid, start: Position, stops: Sequence[Position], return_to_start: bool = False,
+              exact_limit: int = EXACT_LIMIT) -> TourResult:
+    """Cheapest order to visit every stop from start, and the cell path that walks it.
+
+    One Dijkstra expansion per point (start and each stop) settles its walking
+    cost to all the other points at once, and its parent map later supplies the
+    legs of the stitched path. Costs may be asymmetric on weighted grids, and
+    both solvers handle that. Up to exact_limit stops the order is solved
+    exactly by Held-Karp dynamic programming (O(2^n n^2)). Past that it is built
+    by nearest neighbor and improved with 2-opt and Or-opt moves until neither
+    helps.
+    """
+    stats = SearchStats()
+    start_time = time.perf_counter()
+    stops = [stop for stop in dict.fromkeys(tuple(stop) for stop in stops) if stop != tuple(start)]
+    points = [tuple(start)] + stops
+    cells = [grid.cell_id(*point) for point in points]
+
+    parents: List[Dict[int, Optional[int]]] = []
+    cost = []
+    for cell in cells:
+        distances, parent = _expand(grid, cell, set(cells), stats)
+        parents.append(parent)
+        cost.append([distances.get(other, INF) for other in cells])
+
+    n = len(stops)
+    if any(cost[0][i] == INF for i in range(1, n + 1)):
+        stats.wall_ms = (time.perf_counter() - start_time) * 1000
+        return TourResult(stops, None, None, n <= exact_limit, stats)
+
+    if n <= exact_limit:
+        order, total = _held_karp(cost, n, return_to_start)
+    else:
+        order = _nearest_neighbor(cost, n)
+        order, total = _improve(cost, order, return_to_start)
+
+    path = [points[0]]
+    previous = 0
+    for index in order + ([0] if return_to_start else []):
+        path += trace_parents(grid, parents[previous], cells[index])[1:]
+        previous = index
+    stats.wall_ms = (time.perf_counter() - start_time) * 1000
+    return TourResult([points[index] for index in order], path, int(total), n <= exact_limit, stats)
+
+def _expand(grid: Grid, source: int, targets: set, stats: SearchStats) -> Tuple[Dict[int, int], Dict[int, Optional[int]]]:
+    # Dijkstra from source that stops once every target is settled
+    cells, costs = grid.cells, grid.costs
+    distances = {source: 0}
+    parent: Dict[int, Optional[int]] = {source: None}
+    settled = set()
+    remaining = len(targets - {source})
+    queue = [(0, source)]
+    while queue and remaining:
+        d, cell = heapq.heappop(queue)
+        if cell in settled:
+            continue
+        settled.add(cell)
+        stats.nodes_expanded += 1
+        if cell in targets and cell != source:
+            remaining -= 1
+        for neighbor in grid.neighbors(cell):
+            step = d + costs[cells[neighbor]]
+            if neighbor not in settled and step < distances.get(neighbor, INF):
+                distances[neighbor] = step
+                parent[neighbor] = cell
+                heapq.heappush(queue, (step, neighbor))
+    stats.peak_closed = max(stats.peak_closed, len(settled))
+    return {cell: distances[cell] for cell in settled}, parent
+
+def _tour_cost(cost: List[List[float]], order: List[int], return_to_start: bool) -> float:
+    total = 0
+    previous = 0
+    for index in order:
+        total += cost[previous][index]
+        previous = index
+    return total + (cost[previous][0] if return_to_start else 0)
+
+def _held_karp(cost: List[List[float]], n: int, return_to_start: bool) -> Tuple[List[int], float]:
+    # best[mask][j]: cheapest walk from the start through the stops in mask, ending at stop j (1-based)
+    if n == 0:
+        return [], 0
+    full = (1 << n) - 1
+    best = [[INF] * (n + 1) for _ in range(1 << n)]
+    came_from = [[0] * (n + 1) for _ in range(1 << n)]
+    for j in range(1, n + 1):
+        best[1 << (j - 1)][j] = cost[0][j]
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j in range(1, n + 1):
+            here = row[j]
+            if here == INF or not mask & (1 << (j - 1)):
+                continue
+            for k in range(1, n + 1):
+                bit = 1 << (k - 1)
+                if mask & bit:
+                    continue
+                candidate = here + cost[j][k]
+                if candidate < best[mask | bit][k]:
+                    best[mask | bit][k] = candidate
+                    came_from[mask | bit][k] = j
+
+    closing = [best[full][j] + (cost[j][0] if return_to_start else 0) for j in range(n + 1)]
+    last = min(range(1, n + 1), key=closing.__getitem__)
+    total = closing[last]
+    order = []
+    mask = full
+    while last:
+        order.append(last)
+        mask, last = mask & ~(1 << (last - 1)), came_from[mask][last]
+    return order[::-1], total
+
+def _nearest_neighbor(cost: List[List[float]], n: int) -> List[int]:
+    order, left, current = [], set(range(1, n + 1)), 0
+    while left:
+        current = min(left, key=lambda k: (cost[current][k], k))
+        order.append(current)
+        left.remove(current)
+    return order
+
+def _improve(cost: List[List[float]], order: List[int], return_to_start: bool) -> Tuple[List[int], float]:
+    # alternates 2-opt (reverse a stretch) and Or-opt (move a run of 1-3 stops) until neither finds a gain;
+    # legs are asymmetric, so each candidate is priced in full rather than by its end edges alone
+    total = _tour_cost(cost, order, return_to_start)
+    improved = True
+    while improved:
+        improved = False
+        for i, j in itertools.combinations(range(len(order)), 2):
+            candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+            candidate_cost = _tour_cost(cost, candidate, return_to_start)
+            if candidate_cost < total:
+                order, total, improved = candidate, candidate_cost, True
+        for length in (1, 2, 3):
+            for i in range(len(order) - length + 1):
+                run, rest = order[i:i + length], order[:i] + order[i + length:]
+                for position in range(len(rest) + 1):
+                    if position == i:
+                        continue
+                    candidate = rest[:position] + run + rest[position:]
+                    candidate_cost = _tour_cost(cost, candidate, return_to_start)
+                    if candidate_cost < total:
+                        order, total, improved = candidate, candidate_cost, True
+                        break
+    return order, total